@@ -3,7 +3,6 @@ import datetime
 
 # > 3rd Party Dependencies
 import pandas as pd
-import yfinance as yf
 
 # Discord imports
 import discord
@@ -15,6 +14,7 @@ from util.vars import config
 from util.db import get_db, update_db
 from util.disc_util import get_channel
 from util.confirm_stock import confirm_stock
+from util.yf_info import get_yf_price
 
 
 class Stock(commands.Cog):
@@ -141,16 +141,18 @@ class Stock(commands.Cog):
                         update_db(old_db, "assets")
                     await ctx.send("Succesfully added your stock to the database!")
 
-                    stock_info = yf.Ticker(ticker)
+                    # Reuses the info that confirm_stock() just requested
+                    price = await get_yf_price(ticker)
 
-                    # Send message in trades channel
-                    await self.stock_trade_msg(
-                        ctx.message.author,
-                        "Bought",
-                        ticker,
-                        stock_info.info["regularMarketPrice"],
-                        amount,
-                    )
+                    # Send message in trades channel, if the price is known
+                    if price is not None:
+                        await self.stock_trade_msg(
+                            ctx.message.author,
+                            "Bought",
+                            ticker,
+                            price,
+                            amount,
+                        )
 
                 else:
                     await ctx.send("Please specify a ticker and amount!")
@@ -204,14 +206,16 @@ class Stock(commands.Cog):
                                 f"Succesfully removed {amount} {ticker.upper()} from your owned stocks!"
                             )
 
-                        # Send message in trades channel
-                        await self.stock_trade_msg(
-                            ctx.message.author,
-                            "Sold",
-                            ticker,
-                            yf.Ticker(ticker).info["regularMarketPrice"],
-                            amount,
-                        )
+                        # Send message in trades channel, if the price is known
+                        price = await get_yf_price(ticker)
+                        if price is not None:
+                            await self.stock_trade_msg(
+                                ctx.message.author,
+                                "Sold",
+                                ticker,
+                                price,
+                                amount,
+                            )
 
                     else:
                         await ctx.send("You do not own this stock!")
@@ -12,12 +12,13 @@ import pandas as pd
 
 # > Local dependencies
 from cogs.loops.trades import Binance, KuCoin
-from util.ticker import get_stock_info
+from util.ticker import get_stock_info, get_coin_markets
+from util.yf_info import get_yf_quotes
 from util.db import get_db, update_db
 from util.disc_util import get_channel, get_user
-from util.vars import stables, cg_coins, cg
+from util.vars import stables, get_cg_coins, get_cg_best_id
 from util.disc_util import get_guild
-from util.tv_data import TV_data
+from util.tv_data import tv
 from util.formatting import format_embed_length
 
 
@@ -42,7 +43,7 @@ class Assets(commands.Cog):
         self, bot: commands.Bot, db: pd.DataFrame = get_db("portfolio")
     ) -> None:
         self.bot = bot
-        self.tv = TV_data()
+        self.tv = tv
 
         # Refresh assets
         asyncio.create_task(self.assets(db))
@@ -77,23 +78,19 @@ class Assets(commands.Cog):
             )
 
         if usd_val == 0:
-            if asset in cg_coins["symbol"].values:
-                ids = cg_coins[cg_coins["symbol"] == asset]["id"]
-                if len(ids) > 1:
-                    best_vol = 0
-                    coin_dict = None
-                    for symbol in ids.values:
-                        coin_info = cg.get_coin_by_id(symbol)
-                        if "usd" in coin_info["market_data"]["total_volume"]:
-                            volume = coin_info["market_data"]["total_volume"]["usd"]
-                            if volume > best_vol:
-                                best_vol = volume
-                                coin_dict = coin_info
-                else:
-                    coin_dict = cg.get_coin_by_id(ids.values[0])
+            if ids := get_cg_coins().ids_by_symbol(asset):
+                # Symbols of multiple coins are resolved in the background
+                if len(ids) > 1 and (best_id := get_cg_best_id(asset)) in ids:
+                    ids = [best_id]
+
+                # Get all coins with this symbol in one request, the one with the most volume is used
+                markets = await get_coin_markets(ids)
 
                 try:
-                    price = coin_dict["market_data"]["current_price"]["usd"]
+                    coin_dict = max(
+                        markets.values(), key=lambda coin: coin["total_volume"] or 0
+                    )
+                    price = coin_dict["current_price"]
                     return price * owned
                 except Exception as e:
                     print(
@@ -238,6 +235,10 @@ class Assets(commands.Cog):
         sorted_df = sorted_df.round({"owned": 3})
         exchange_df = sorted_df.drop(sorted_df[sorted_df.owned == 0].index)
 
+        # Get the quotes of all stocks in one request, get_stock_info() then reuses them
+        if exchange == "Stocks":
+            await get_yf_quotes(exchange_df["asset"].to_list())
+
         usd_values = []
         for sym in exchange_df["asset"].to_list():
             if sym not in stables:
@@ -249,16 +250,28 @@ class Assets(commands.Cog):
                         sym + "-USDT"
                     )
                 elif exchange == "Stocks":
-                    usd_val = await get_stock_info(sym)
-                    usd_val = usd_val[3][0]
-
-                if usd_val == 0 and exchange != "Stocks":
-                    # Exchange is None, because it is not on this exchange
-                    usd_val = await self.usd_value(sym, 1, None)
+                    stock = await get_stock_info(sym)
+                    usd_val = stock[3][0] if stock else 0
                 usd_values.append(usd_val)
             else:
                 usd_values.append(1)
 
+        if exchange != "Stocks":
+            # The coins that are not on this exchange nor on CoinGecko are priced by TradingView
+            # Request them in one go, usd_value() then reuses these quotes
+            missing = [
+                sym
+                for sym, usd_val in zip(exchange_df["asset"].to_list(), usd_values)
+                if usd_val == 0 and not get_cg_coins().ids_by_symbol(sym)
+            ]
+            if missing:
+                await self.tv.get_tv_quotes(missing, "crypto")
+
+            for i, sym in enumerate(exchange_df["asset"].to_list()):
+                if usd_values[i] == 0:
+                    # Exchange is None, because it is not on this exchange
+                    usd_values[i] = await self.usd_value(sym, 1, None)
+
         # Add new column for usd values
         exchange_df["usd_value"] = usd_values
 
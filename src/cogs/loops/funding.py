@@ -9,7 +9,7 @@ from discord.ext import commands
 from discord.ext.tasks import loop
 
 # Local dependencies
-from util.vars import config, get_json_data
+from util.vars import config, get_json_data_if_changed
 from util.disc_util import get_channel
 
 
@@ -21,12 +21,17 @@ class Funding(commands.Cog):
     -------
     funding() -> None:
         This function gets the data from the funding API and posts it in the funding channel.
+    get_lowest(binance_data: list) -> pd.DataFrame:
+        Gets the 15 lowest funding rates of the USDT pairs, formatted as percentages.
     """
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self.channel = get_channel(self.bot, config["LOOPS"]["FUNDING"]["CHANNEL"])
 
+        # The 15 lowest funding rates of the last response, reused if the response did not change
+        self.lowest = None
+
         self.funding.start()
 
     @loop(hours=4)
@@ -40,44 +45,20 @@ class Funding(commands.Cog):
         """
 
         # Get the JSON data from the Binance API
-        binance_data = await get_json_data(
-            "https://fapi.binance.com/fapi/v1/premiumIndex"
+        # Without a symbol Binance counts this as 10 requests
+        binance_data = await get_json_data_if_changed(
+            "https://fapi.binance.com/fapi/v1/premiumIndex", weight=10
         )
 
+        # The response is identical to the last one, so the rates are the same
+        if binance_data is None and self.lowest is not None:
+            lowest = self.lowest
         # If the call did not work
-        if not binance_data:
+        elif not binance_data:
             print("Could not get funding data...")
             return
-
-        # Cast to dataframe
-        df = pd.DataFrame(binance_data)
-
-        # Keep only the USDT pairs
-        df = df[df["symbol"].str.contains("USDT")]
-
-        # Remove USDT from the symbol
-        df["symbol"] = df["symbol"].str.replace("USDT", "")
-
-        # Set it to numeric
-        df["lastFundingRate"] = df["lastFundingRate"].apply(pd.to_numeric)
-
-        # Sort on lastFundingRate, lowest to highest
-        sorted = df.sort_values(by="lastFundingRate", ascending=True)
-
-        # Multiply by 100 to get the funding rate in percent
-        sorted["lastFundingRate"] = sorted["lastFundingRate"] * 100
-
-        # Round to 4 decimal places
-        sorted["lastFundingRate"] = sorted["lastFundingRate"].round(4)
-
-        # Convert them back to string
-        sorted = sorted.astype(str)
-
-        # Add percentage to it
-        sorted["lastFundingRate"] = sorted["lastFundingRate"] + "%"
-
-        # Post the top 15 lowest
-        lowest = sorted.head(15)
+        else:
+            lowest = self.get_lowest(binance_data)
 
         e = discord.Embed(
             title=f"Binance Top 15 Lowest Funding Rates",
@@ -118,6 +99,53 @@ class Funding(commands.Cog):
         # Post the embed in the channel
         await self.channel.send(embed=e)
 
+    def get_lowest(self, binance_data: list) -> pd.DataFrame:
+        """
+        Gets the 15 lowest funding rates of the USDT pairs, formatted as percentages.
+
+        Parameters
+        ----------
+        binance_data : list
+            The response of the premiumIndex endpoint.
+
+        Returns
+        -------
+        pd.DataFrame
+            The 15 USDT pairs with the lowest funding rate.
+        """
+
+        # Cast to dataframe
+        df = pd.DataFrame(binance_data)
+
+        # Keep only the USDT pairs
+        df = df[df["symbol"].str.contains("USDT")]
+
+        # Remove USDT from the symbol
+        df["symbol"] = df["symbol"].str.replace("USDT", "")
+
+        # Set it to numeric
+        df["lastFundingRate"] = df["lastFundingRate"].apply(pd.to_numeric)
+
+        # Sort on lastFundingRate, lowest to highest
+        sorted = df.sort_values(by="lastFundingRate", ascending=True)
+
+        # Multiply by 100 to get the funding rate in percent
+        sorted["lastFundingRate"] = sorted["lastFundingRate"] * 100
+
+        # Round to 4 decimal places
+        sorted["lastFundingRate"] = sorted["lastFundingRate"].round(4)
+
+        # Convert them back to string
+        sorted = sorted.astype(str)
+
+        # Add percentage to it
+        sorted["lastFundingRate"] = sorted["lastFundingRate"] + "%"
+
+        # Post the top 15 lowest
+        self.lowest = sorted.head(15)
+
+        return self.lowest
+
 
 def setup(bot: commands.Bot) -> None:
     bot.add_cog(Funding(bot))
@@ -7,7 +7,7 @@ from discord.ext import commands
 from discord.ext.tasks import loop
 
 # Local dependencies
-from util.vars import config, get_json_data
+from util.vars import config, stream_json_data
 from util.disc_util import get_channel
 from util.afterhours import afterHours
 from util.formatting import format_embed
@@ -62,7 +62,13 @@ class Gainers(commands.Cog):
         None
         """
 
-        binance_data = await get_json_data("https://api.binance.com/api/v3/ticker/24hr")
+        # Without a symbol Binance counts this as 40 requests
+        # Only read the columns that are used, instead of the complete response
+        binance_data = await stream_json_data(
+            "https://api.binance.com/api/v3/ticker/24hr",
+            fields=["symbol", "priceChangePercent", "weightedAvgPrice", "volume"],
+            weight=40,
+        )
 
         # If the call did not work
         if not binance_data:
@@ -10,7 +10,7 @@ from discord.ext.tasks import loop
 # Local dependencies
 from util.vars import config, get_json_data
 from util.disc_util import get_channel
-from util.tv_data import TV_data
+from util.tv_data import tv
 from util.afterhours import afterHours
 from util.formatting import human_format
 
@@ -33,7 +33,7 @@ class Index(commands.Cog):
 
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
-        self.tv = TV_data()
+        self.tv = tv
 
         if config["LOOPS"]["INDEX"]["CRYPTO"]["ENABLED"]:
             self.crypto_channel = get_channel(
@@ -59,7 +59,10 @@ class Index(commands.Cog):
             The percentual change compared to yesterday's Fear and Greed index.
         """
 
-        response = await get_json_data("https://api.alternative.me/fng/?limit=2")
+        # The index is only updated once a day
+        response = await get_json_data(
+            "https://api.alternative.me/fng/?limit=2", max_age=60 * 60
+        )
 
         if "data" in response.keys():
             today = int(response["data"][0]["value"])
@@ -93,8 +96,11 @@ class Index(commands.Cog):
         prices = []
         changes = []
 
+        # All indices in one request
+        tv_quotes = await self.tv.get_tv_quotes(crypto_indices, "crypto")
+
         for index in crypto_indices:
-            tv_data = await self.tv.get_tv_data(index, "crypto")
+            tv_data = tv_quotes.get(index, False)
             if tv_data == False:
                 continue
             price, change, _, exchange = tv_data
@@ -179,8 +185,11 @@ class Index(commands.Cog):
         prices = []
         changes = []
 
+        # All indices in one request
+        tv_quotes = await self.tv.get_tv_quotes(stock_indices, "stock")
+
         for index in stock_indices:
-            tv_data = await self.tv.get_tv_data(index, "stock")
+            tv_data = tv_quotes.get(index, False)
             if tv_data == False:
                 continue
             price, change, _, exchange = tv_data
@@ -1,5 +1,6 @@
 import asyncio
 import datetime
+from typing import Optional
 
 # > Discord dependencies
 import discord
@@ -7,7 +8,7 @@ from discord.ext import commands
 from discord.ext.tasks import loop
 
 # Local dependencies
-from util.vars import config, get_json_data
+from util.vars import config, stream_json_data
 from util.disc_util import get_channel
 
 
@@ -18,7 +19,7 @@ class Exchange_Listings:
 
     Methods
     -------
-    get_symbols() -> list:
+    get_symbols(if_changed: bool = False) -> Optional[list]:
         Gets the symbols currently listed on the exchange.
 
     """
@@ -32,36 +33,52 @@ class Exchange_Listings:
         asyncio.create_task(self.set_old_symbols())
         self.new_listings.start()
 
-    async def get_symbols(self) -> list:
+    async def get_symbols(self, if_changed: bool = False) -> Optional[list]:
         """
         Gets the symbols currently listed on the exchange.
 
+        Parameters
+        ----------
+        if_changed : bool, optional
+            If True, None is returned when the listings did not change since the last request, by default False.
+
         Returns
         -------
-        list
-            The symbols currently listed on the exchange
+        Optional[list]
+            The symbols currently listed on the exchange, None if the request failed.
         """
 
+        # The request weight for the rate limiter
+        weight = 1
+
         if self.exchange == "binance":
             url = "https://api.binance.com/api/v3/exchangeInfo"
             key1 = "symbols"
             key2 = "symbol"
+            # Binance counts this as 10 requests
+            weight = 10
         elif self.exchange == "kucoin":
             url = "https://api.kucoin.com/api/v1/symbols"
             key1 = "data"
             key2 = "symbol"
         elif self.exchange == "coinbase":
             url = "https://api.exchange.coinbase.com/currencies"
+            # The response is the list itself
+            key1 = None
             key2 = "id"
 
         # Check if there have been new listings
-        response = await get_json_data(url)
+        # Only the symbol names are read from the (multiple MB) response
+        response = await stream_json_data(
+            url, key=key1, fields=[key2], weight=weight, if_changed=if_changed
+        )
 
-        # Get the symbols
-        if self.exchange == "coinbase":
-            return [x[key2] for x in response]
+        # Nothing changed since the last check, or the request failed
+        if response is None:
+            return None
 
-        return [x[key2] for x in response[key1]]
+        # Get the symbols
+        return [x[key2] for x in response]
 
     def create_embed(self, ticker: str) -> discord.Embed:
         """
@@ -114,8 +131,8 @@ class Exchange_Listings:
         None
         """
 
-        # Set the old symbols
-        self.old_symbols = await self.get_symbols()
+        # Set the old symbols, keep them empty if the request failed
+        self.old_symbols = await self.get_symbols() or []
 
     @loop(hours=6)
     async def new_listings(self) -> None:
@@ -129,13 +146,18 @@ class Exchange_Listings:
         None
         """
 
-        # Get the symbols
-        new_symbols = await self.get_symbols()
+        # Get the symbols, the rest can be skipped if the response is identical to the last one
+        new_symbols = await self.get_symbols(if_changed=True)
+
+        if new_symbols is None:
+            return
 
         new_listings = []
 
+        # The symbols could not be requested at startup, so start comparing from now on
         if self.old_symbols == []:
-            await self.set_old_symbols()
+            self.old_symbols = new_symbols
+            return
 
         # If there is a new symbol, send a message
         if len(new_symbols) > len(self.old_symbols):
@@ -11,7 +11,7 @@ from discord.ext import commands
 from discord.ext.tasks import loop
 
 # Local dependencies
-from util.vars import config, get_json_data
+from util.vars import config, get_json_data_if_changed
 from util.disc_util import get_channel
 
 
@@ -32,6 +32,9 @@ class StockTwits(commands.Cog):
         self.bot = bot
         self.channel = get_channel(self.bot, config["LOOPS"]["STOCKTWITS"]["CHANNEL"])
 
+        # The formatted fields per keyword, reused if the response did not change
+        self.fields = {}
+
         self.stocktwits.start()
 
     async def get_data(self, e: discord.Embed, keyword: str) -> discord.Embed:
@@ -52,7 +55,19 @@ class StockTwits(commands.Cog):
         """
 
         # Keyword can be "ts", "m_day", "wl_ct_day"
-        data = await get_json_data("https://api.stocktwits.com/api/2/charts/" + keyword)
+        data = await get_json_data_if_changed(
+            "https://api.stocktwits.com/api/2/charts/" + keyword
+        )
+
+        # The response is identical to the last one, so skip the formatting
+        if data is None and keyword in self.fields:
+            for name, value in self.fields[keyword]:
+                e.add_field(name=name, value=value, inline=True)
+            return e
+
+        # The request failed, or the unchanged response was never formatted
+        if data is None:
+            return e
 
         table = pd.DataFrame(data["table"][keyword])
         stocks = pd.DataFrame(data["stocks"]).T
@@ -91,9 +106,10 @@ class StockTwits(commands.Cog):
         prices = "\n".join(full_df["price"].to_list())
         values = "\n".join(full_df["val"].to_list())
 
-        e.add_field(name=name, value=assets, inline=True)
-        e.add_field(name="Price", value=prices, inline=True)
-        e.add_field(name=val, value=values, inline=True)
+        self.fields[keyword] = [(name, assets), ("Price", prices), (val, values)]
+
+        for name, value in self.fields[keyword]:
+            e.add_field(name=name, value=value, inline=True)
 
         return e
 
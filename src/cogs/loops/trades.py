@@ -4,7 +4,6 @@ import asyncio
 import time
 import hmac
 import base64
-import json
 import hashlib
 import datetime
 import hmac
@@ -20,7 +19,9 @@ import aiohttp
 # Local dependencies
 from util.db import get_db, update_db
 from util.disc_util import get_channel, get_user
-from util.vars import config, stables, get_json_data, post_json_data
+from util.vars import config, stables, get_json_data, post_json_data, ws_connect
+from util.quotes import quotes
+from util.json_codec import loads, dumps
 
 # Used to keep track of sent messages
 messages = []
@@ -152,8 +153,10 @@ class Binance:
         This function is used to get the account information from the binance API and convert it to a pandas dataframe.
     get_base_sym(sym: str) -> str:
         This function is used to get the base symbol of a symbol.
-    get_usd_price(symbol: str) -> float:
+    get_usd_price(symbol: str, max_age: float = None) -> float:
         Gets the USD price of a symbol.
+    fetch_usd_price(symbol: str) -> float:
+        Requests the USD price of a symbol from Binance.
     on_msg(msg: str) -> None:
         This function is used to handle the incoming messages from the binance websocket.
     restart_sockets() -> None:
@@ -203,7 +206,7 @@ class Binance:
             self.secret.encode("utf-8"), query_string.encode("utf-8"), hashlib.sha256
         ).hexdigest()
 
-    async def send_signed_request(self, url_path: str) -> dict:
+    async def send_signed_request(self, url_path: str, weight: int = 1) -> dict:
         """
         Sends the signed request to the binance API.
         Necessary to show that you own this account.
@@ -212,6 +215,8 @@ class Binance:
         ----------
         url_path : str
             The path following the base url, for instance "/api/v3/account".
+        weight : int, optional
+            The request weight of this endpoint, by default 1.
 
         Returns
         -------
@@ -233,7 +238,7 @@ class Binance:
             "X-MBX-APIKEY": self.key,
         }
 
-        return await get_json_data(url, headers)
+        return await get_json_data(url, headers, weight=weight)
 
     async def get_data(self) -> pd.DataFrame:
         """
@@ -246,7 +251,7 @@ class Binance:
             Dataframe containing the account balance.
         """
 
-        response = await self.send_signed_request("/api/v3/account")
+        response = await self.send_signed_request("/api/v3/account", weight=10)
         balances = response["balances"]
 
         # Ensure that the user is set
@@ -287,9 +292,10 @@ class Binance:
             The base symbol of the symbol sent as input.
         """
 
-        # Use the Binance API to get the correct base symbol
+        # Use the Binance API to get the correct base symbol, this never changes
         response = await get_json_data(
-            f"https://api.binance.com/api/v3/exchangeInfo?symbol={sym}"
+            f"https://api.binance.com/api/v3/exchangeInfo?symbol={sym}",
+            max_age=24 * 60 * 60,
         )
 
         if "symbols" in response.keys():
@@ -298,15 +304,18 @@ class Binance:
             # Otherwise return the symbol given
             return sym
 
-    async def get_usd_price(self, symbol: str) -> float:
+    async def get_usd_price(self, symbol: str, max_age: float = None) -> float:
         """
         Gets the USD price of a symbol.
         Symbol must only be usign the base symbol, for instance "BTC" will return the price of BTCUSD.
+        The price is shared with the other cogs, it is only requested if it is older than max_age seconds.
 
         Parameters
         ----------
         symbol : str
             The base symbol that we want to know the USD price of.
+        max_age : float, optional
+            The maximum age of the price in seconds, by default the QUOTES.MAX_AGE setting.
 
         Returns
         -------
@@ -314,6 +323,25 @@ class Binance:
             The USD price of the symbol given.
         """
 
+        return await quotes.get(
+            "binance", symbol, lambda: self.fetch_usd_price(symbol), max_age
+        )
+
+    async def fetch_usd_price(self, symbol: str) -> float:
+        """
+        Requests the USD price of a symbol from Binance.
+
+        Parameters
+        ----------
+        symbol : str
+            The base symbol that we want to know the USD price of.
+
+        Returns
+        -------
+        float
+            The USD price of the symbol given, 0 if it is not quoted in USD.
+        """
+
         # Use for-loop using USDT, USD, BUSD, DAI
         for usd in stables:
             response = await get_json_data(
@@ -345,7 +373,7 @@ class Binance:
         """
 
         # Convert the message to a json object (dict)
-        msg = json.loads(msg)
+        msg = loads(msg)
 
         if msg["e"] == "executionReport":
             sym = msg["s"]  # ie 'YFIUSDT'
@@ -409,10 +437,8 @@ class Binance:
 
         if self.ws is not None:
             await self.ws.close()
-            await self.session.close()
 
             del self.ws
-            del self.session
 
             await asyncio.sleep(60)
             await self.start_sockets()
@@ -435,8 +461,7 @@ class Binance:
         )
 
         if "listenKey" in listen_key.keys():
-            self.session = aiohttp.ClientSession()
-            async with self.session.ws_connect(
+            async with ws_connect(
                 url=f'wss://stream.binance.com:9443/ws/{listen_key["listenKey"]}',
                 heartbeat=60 * 3,
             ) as self.ws:
@@ -460,8 +485,10 @@ class KuCoin:
     -------
     get_data() -> pd.DataFrame:
         Gets the KuCoin assets of the user
-    get_quote_price(self, symbol: str) -> float:
+    get_quote_price(self, symbol: str, max_age: float = None) -> float:
         Gets the quote price of a symbol.
+    fetch_quote_price(self, symbol: str) -> float:
+        Requests the quote price of a symbol from KuCoin.
     on_msg(msg: str) -> None:
         This function is used to handle the incoming messages from the KuCoin websocket.
     restart_sockets() -> None:
@@ -549,14 +576,17 @@ class KuCoin:
 
         return pd.DataFrame(owned)
 
-    async def get_quote_price(self, symbol: str) -> float:
+    async def get_quote_price(self, symbol: str, max_age: float = None) -> float:
         """
         Gets the quote price of a symbol.
+        The price is shared with the other cogs, it is only requested if it is older than max_age seconds.
 
         Parameters
         ----------
         symbol: str
                 Symbol should be in the format of 'BASE-QUOTE, i.e. 'BTC-USDT'.
+        max_age : float, optional
+            The maximum age of the price in seconds, by default the QUOTES.MAX_AGE setting.
 
         Returns
         -------
@@ -564,6 +594,25 @@ class KuCoin:
             Returns the value of a symbol in USD
         """
 
+        return await quotes.get(
+            "kucoin", symbol, lambda: self.fetch_quote_price(symbol), max_age
+        )
+
+    async def fetch_quote_price(self, symbol: str) -> float:
+        """
+        Requests the quote price of a symbol from KuCoin.
+
+        Parameters
+        ----------
+        symbol: str
+                Symbol should be in the format of 'BASE-QUOTE, i.e. 'BTC-USDT'.
+
+        Returns
+        -------
+        float
+            Returns the value of a symbol in USD, 0 if it is not known
+        """
+
         response = await get_json_data(
             f"https://api.kucoin.com/api/v1/market/stats?symbol={symbol}"
         )
@@ -592,7 +641,7 @@ class KuCoin:
         """
 
         # Convert the string to dict
-        msg = json.loads(msg)
+        msg = loads(msg)
 
         if "topic" in msg.keys():
             if (
@@ -664,10 +713,8 @@ class KuCoin:
 
         if self.ws is not None:
             await self.ws.close()
-            await self.session.close()
 
             del self.ws
-            del self.session
 
             await asyncio.sleep(60)
             await self.start_sockets()
@@ -752,14 +799,13 @@ class KuCoin:
                 int(response["data"]["instanceServers"][0]["pingTimeout"]) // 1000
             )
 
-            self.session = aiohttp.ClientSession()
-            async with self.session.ws_connect(
+            async with ws_connect(
                 url=f"wss://ws-api.kucoin.com/endpoint?token={token}",
                 heartbeat=ping_interval,
                 timeout=ping_timeout,
             ) as self.ws:
                 await self.ws.send_str(
-                    json.dumps(
+                    dumps(
                         {
                             "type": "subscribe",
                             "topic": "/spotMarket/tradeOrders",
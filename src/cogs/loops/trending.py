@@ -1,5 +1,4 @@
 # > 3rd party dependencies
-from pycoingecko import CoinGeckoAPI
 import yahoo_fin.stock_info as si
 import pandas as pd
 
@@ -9,6 +8,7 @@ from discord.ext.tasks import loop
 
 # Local dependencies
 from util.vars import config, get_json_data
+from util.ticker import get_coin_markets
 from util.disc_util import get_channel
 from util.afterhours import afterHours
 from util.formatting import format_embed
@@ -93,22 +93,30 @@ class Trending(commands.Cog):
         None
         """
 
-        cg = CoinGeckoAPI()
-
         ticker = []
         prices = []
         price_changes = []
         vol = []
 
-        for coin in cg.get_search_trending()["coins"]:
-            coin_dict = cg.get_coin_by_id(coin["item"]["id"])
+        trending = await get_json_data(
+            "https://api.coingecko.com/api/v3/search/trending"
+        )
+        coins = trending.get("coins", [])
+
+        # Get the market data of all trending coins in one request
+        markets = await get_coin_markets([coin["item"]["id"] for coin in coins])
+
+        for coin in coins:
+            coin_dict = markets.get(coin["item"]["id"])
+            if coin_dict is None:
+                continue
 
             website = f"https://coingecko.com/en/coins/{coin['item']['id']}"
-            price = coin_dict["market_data"]["current_price"]["usd"]
-            price_change = coin_dict["market_data"]["price_change_percentage_24h"]
+            price = coin_dict["current_price"]
+            price_change = coin_dict["price_change_percentage_24h"]
 
             ticker.append(f"[{coin['item']['symbol']}]({website})")
-            vol.append(coin_dict["market_data"]["total_volume"]["usd"])
+            vol.append(coin_dict["total_volume"])
             prices.append(price)
             price_changes.append(price_change)
 
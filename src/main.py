@@ -12,7 +12,10 @@ import discord
 from discord.ext import commands
 
 # Import local dependencies
-from util.vars import config
+from util.vars import config, close_session, refresh_cg_best_ids
+from util.tv_socket import tv_quotes
+from util.tv_data import update_tv_universe
+from util.ticker_cache import flush_ticker_cache, flush_classifications
 
 bot = commands.Bot(command_prefix=config["PREFIX"], intents=discord.Intents.all())
 bot.remove_command("help")
@@ -29,6 +32,14 @@ async def on_ready():
         else config["DISCORD"]["GUILD_NAME"],
     )
 
+    # Refresh the TradingView symbols and CoinGecko best ids in the background, on_ready can be called again after a reconnect
+    if not update_tv_universe.is_running():
+        update_tv_universe.start()
+    if not refresh_cg_best_ids.is_running():
+        refresh_cg_best_ids.start()
+    if not flush_ticker_cache.is_running():
+        flush_ticker_cache.start()
+
     # Load commands
     load_folder("commands")
 
@@ -91,9 +102,18 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("Caught interrupt signal.")
         print("exiting...")
+
+        # Save the classifications that were not written yet
+        flush_classifications()
+
         bot.loop.run_until_complete(
             asyncio.wait(
-                [bot.change_presence(status=discord.Status.invisible), bot.logout()]
+                [
+                    bot.change_presence(status=discord.Status.invisible),
+                    bot.logout(),
+                    tv_quotes.close(),
+                    close_session(),
+                ]
             )
         )
     finally:
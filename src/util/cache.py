@@ -0,0 +1,111 @@
+## > Imports
+# > Standard libaries
+from __future__ import annotations
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    A least recently used cache where every entry remembers when it was stored.
+    Callers decide per lookup how old an entry is allowed to be.
+    The cache is bounded by the number of entries and by the total size of the entries.
+
+    Methods
+    -------
+    get(key: Hashable, max_age: float) -> Optional[Any]:
+        Returns the cached value if it is not older than max_age seconds.
+    set(key: Hashable, value: Any, size: int = 1) -> None:
+        Stores the value, evicting the least recently used entries if the cache is full.
+    clear() -> None:
+        Removes all entries from the cache.
+    """
+
+    def __init__(self, max_entries: int = 512, max_size: int = 50_000_000) -> None:
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+
+        # Maps key -> (timestamp, size, value), ordered from least to most recently used
+        self.entries = OrderedDict()
+
+        # Counters for monitoring the effectiveness of the cache
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Hashable, max_age: float) -> Optional[Any]:
+        """
+        Returns the cached value if it is not older than max_age seconds.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key the value was stored under.
+        max_age : float
+            The maximum age of the entry in seconds.
+
+        Returns
+        -------
+        Optional[Any]
+            The cached value, or None if it is missing or too old.
+        """
+
+        entry = self.entries.get(key)
+
+        if entry is None or time.monotonic() - entry[0] > max_age:
+            self.stats["misses"] += 1
+            return None
+
+        # Mark it as most recently used
+        self.entries.move_to_end(key)
+        self.stats["hits"] += 1
+
+        return entry[2]
+
+    def set(self, key: Hashable, value: Any, size: int = 1) -> None:
+        """
+        Stores the value, evicting the least recently used entries if the cache is full.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key to store the value under.
+        value : Any
+            The value to store.
+        size : int, optional
+            The size of the value, for instance the length of the response body, by default 1.
+
+        Returns
+        -------
+        None
+        """
+
+        # Do not let a single huge value flush the whole cache
+        if size > self.max_size:
+            return
+
+        if key in self.entries:
+            self.size -= self.entries.pop(key)[1]
+
+        self.entries[key] = (time.monotonic(), size, value)
+        self.size += size
+
+        while len(self.entries) > self.max_entries or self.size > self.max_size:
+            _, (_, old_size, _) = self.entries.popitem(last=False)
+            self.size -= old_size
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """
+        Removes all entries from the cache.
+
+        Returns
+        -------
+        None
+        """
+
+        self.entries.clear()
+        self.size = 0
@@ -0,0 +1,427 @@
+## > Imports
+# > Standard libaries
+from __future__ import annotations
+import asyncio
+import base64
+import hashlib
+import os
+import time
+from collections import deque
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlparse
+
+# > 3rd party dependencies
+import aiohttp
+from multidict import CIMultiDict
+
+# Local dependencies
+from util.json_codec import loads, dumps
+
+# Query parameters that change on every request, such as the signature of Binance requests
+volatile_params = {"timestamp", "signature"}
+
+
+def cassette_name(method: str, url: str, body=None, key: str = None) -> str:
+    """
+    Returns the name of the cassette for this request, the same request always gets the same name.
+
+    Parameters
+    ----------
+    method : str
+        The HTTP method, or "WS" for websockets.
+    url : str
+        The URL of the request.
+    body : optional
+        The data or JSON send with the request, by default None.
+    key : str, optional
+        Extra part of the name, for websockets that share a URL, by default None.
+
+    Returns
+    -------
+    str
+        The path of the cassette, relative to the cassette directory and without extension.
+    """
+
+    parsed = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parsed.query) if k not in volatile_params]
+    digest = hashlib.sha1(
+        dumps([method, parsed.path, query, repr(body), key]).encode()
+    ).hexdigest()[:16]
+
+    return os.path.join(parsed.netloc.replace(":", "_"), f"{method.lower()}-{digest}")
+
+
+class ReplayStream:
+    """
+    Stands in for aiohttp.StreamReader, yields the recorded body in chunks.
+    """
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    async def iter_chunked(self, n: int):
+        for i in range(0, len(self.body), n):
+            yield self.body[i : i + n]
+
+
+class CassetteResponse:
+    """
+    A recorded HTTP response, offers the parts of aiohttp.ClientResponse that the bot uses.
+    """
+
+    def __init__(self, status: int, headers: dict, body: bytes) -> None:
+        self.status = status
+        self.headers = CIMultiDict(headers)
+        self.body = body
+        self.content = ReplayStream(body)
+
+    async def read(self) -> bytes:
+        return self.body
+
+    async def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+    async def json(self, loads: Callable = loads):
+        return loads(self.body)
+
+
+class CassetteRequest:
+    """
+    Async context manager for a request in record or replay mode, used like session.get().
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        get_session: Callable,
+        method: str,
+        url: str,
+        key: str,
+        kwargs: dict,
+    ) -> None:
+        self.cassette = cassette
+        self.get_session = get_session
+        self.method = method
+        self.url = url
+        self.kwargs = kwargs
+        self.name = cassette_name(
+            method, url, kwargs.get("data", kwargs.get("json")), key
+        )
+        self.context = None
+
+    async def __aenter__(self) -> CassetteResponse:
+        if self.cassette.mode == "replay":
+            return await self.cassette.replay(self.method, self.url, self.name)
+
+        # Record the full response, a 304 of a conditional request would replace it with an empty body
+        # Replay ignores the headers, so the polls still see an unchanged body through its hash
+        kwargs = dict(self.kwargs)
+        if kwargs.get("headers"):
+            kwargs["headers"] = {
+                k: v
+                for k, v in kwargs["headers"].items()
+                if k.lower() not in ("if-none-match", "if-modified-since")
+            }
+
+        start = time.monotonic()
+        self.context = self.get_session().request(self.method, self.url, **kwargs)
+        r = await self.context.__aenter__()
+        body = await r.read()
+
+        self.cassette.save(
+            self.name,
+            {
+                "method": self.method,
+                "url": self.url,
+                "status": r.status,
+                "headers": {str(k): v for k, v in r.headers.items()},
+                "latency": time.monotonic() - start,
+                "body": base64.b64encode(body).decode(),
+            },
+        )
+
+        return CassetteResponse(r.status, r.headers, body)
+
+    async def __aexit__(self, *exc) -> None:
+        if self.context is not None:
+            await self.context.__aexit__(*exc)
+
+
+class RecordingWebSocket:
+    """
+    Passes everything to the real websocket and appends the frames to the cassette.
+    """
+
+    def __init__(self, ws: aiohttp.ClientWebSocketResponse, path: str) -> None:
+        self.ws = ws
+        self.path = path
+        self.start = time.monotonic()
+
+        # Start a new recording for this socket
+        open(self.path, "w").close()
+
+    def write(self, direction: str, msg_type: int, data) -> None:
+        with open(self.path, "a") as f:
+            f.write(
+                dumps(
+                    {
+                        "t": time.monotonic() - self.start,
+                        "dir": direction,
+                        "type": int(msg_type),
+                        "data": data if isinstance(data, str) else None,
+                    }
+                )
+                + "\n"
+            )
+
+    async def send_str(self, data: str, *args, **kwargs) -> None:
+        self.write("send", aiohttp.WSMsgType.TEXT, data)
+        await self.ws.send_str(data, *args, **kwargs)
+
+    def __aiter__(self) -> RecordingWebSocket:
+        return self
+
+    async def __anext__(self) -> aiohttp.WSMessage:
+        msg = await self.ws.__anext__()
+        self.write("recv", msg.type, msg.data)
+        return msg
+
+    def __getattr__(self, name: str):
+        return getattr(self.ws, name)
+
+
+class ReplayWebSocket:
+    """
+    Stands in for aiohttp.ClientWebSocketResponse, yields the recorded frames with their original timing.
+    """
+
+    def __init__(self, frames: list, latency: float) -> None:
+        self.frames = deque(frames)
+        self.latency = latency
+        self.start = time.monotonic()
+        self.closed = False
+
+    async def send_str(self, data: str, *args, **kwargs) -> None:
+        pass
+
+    async def close(self, *args, **kwargs) -> None:
+        self.closed = True
+
+    def __aiter__(self) -> ReplayWebSocket:
+        return self
+
+    async def __anext__(self) -> aiohttp.WSMessage:
+        if self.closed or not self.frames:
+            self.closed = True
+            raise StopAsyncIteration
+
+        frame = self.frames.popleft()
+        delay = self.start + frame["t"] * self.latency - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        return aiohttp.WSMessage(aiohttp.WSMsgType(frame["type"]), frame["data"], None)
+
+
+class CassetteWebSocket:
+    """
+    Async context manager for a websocket in record or replay mode, used like session.ws_connect().
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        get_session: Callable,
+        url: str,
+        key: str,
+        kwargs: dict,
+    ) -> None:
+        self.cassette = cassette
+        self.get_session = get_session
+        self.url = url
+        self.kwargs = kwargs
+        self.path = cassette.path(cassette_name("WS", url, key=key), "jsonl")
+        self.context = None
+
+    async def __aenter__(self):
+        if self.cassette.mode == "replay":
+            frames = []
+            if os.path.exists(self.path):
+                with open(self.path) as f:
+                    frames = [loads(line) for line in f]
+            else:
+                print(f"No cassette for websocket {self.url}")
+
+            return ReplayWebSocket(
+                [frame for frame in frames if frame["dir"] == "recv"],
+                self.cassette.latency,
+            )
+
+        self.context = self.get_session().ws_connect(self.url, **self.kwargs)
+        ws = await self.context.__aenter__()
+
+        return RecordingWebSocket(ws, self.path)
+
+    async def __aexit__(self, *exc) -> None:
+        if self.context is not None:
+            await self.context.__aexit__(*exc)
+
+
+class Cassette:
+    """
+    Records the outbound HTTP requests and websocket frames to disk, or replays them from there.
+    This makes it possible to run and benchmark the loops offline.
+    Set it up in the config under ["HTTP"]["CASSETTE"] with MODE ("record" or "replay"), DIR and LATENCY.
+    LATENCY multiplies the recorded latencies during replay, 0 replays everything instantly.
+
+    Methods
+    -------
+    request(get_session: Callable, method: str, url: str, key: str = None, **kwargs):
+        Returns the async context manager for this request, like session.request().
+    ws_connect(get_session: Callable, url: str, key: str = None, **kwargs):
+        Returns the async context manager for this websocket, like session.ws_connect().
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        directory: str = "data/cassettes",
+        latency: float = 1,
+    ) -> None:
+        self.mode = mode
+        self.directory = directory
+        self.latency = latency
+
+        if self.mode not in (None, "record", "replay"):
+            print(f"Unknown cassette mode {self.mode}, not recording or replaying")
+            self.mode = None
+
+    def path(self, name: str, extension: str) -> str:
+        """
+        Returns the path of the cassette file and makes its directory.
+
+        Parameters
+        ----------
+        name : str
+            The name from cassette_name().
+        extension : str
+            The file extension, "json" for requests and "jsonl" for websockets.
+
+        Returns
+        -------
+        str
+            The path of the cassette file.
+        """
+
+        path = os.path.join(self.directory, f"{name}.{extension}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def save(self, name: str, entry: dict) -> None:
+        """
+        Writes a recorded response to disk.
+
+        Parameters
+        ----------
+        name : str
+            The name from cassette_name().
+        entry : dict
+            The recorded request and response.
+
+        Returns
+        -------
+        None
+        """
+
+        with open(self.path(name, "json"), "w") as f:
+            f.write(dumps(entry))
+
+    async def replay(self, method: str, url: str, name: str) -> CassetteResponse:
+        """
+        Returns the recorded response, after waiting for the recorded latency.
+        If the request was never recorded a 404 without body is returned.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        url : str
+            The URL of the request.
+        name : str
+            The name from cassette_name().
+
+        Returns
+        -------
+        CassetteResponse
+            The recorded response.
+        """
+
+        path = os.path.join(self.directory, f"{name}.json")
+
+        if not os.path.exists(path):
+            print(f"No cassette for {method} {url}")
+            return CassetteResponse(404, {}, b"")
+
+        with open(path, "rb") as f:
+            entry = loads(f.read())
+
+        if self.latency:
+            await asyncio.sleep(entry["latency"] * self.latency)
+
+        return CassetteResponse(
+            entry["status"], entry["headers"], base64.b64decode(entry["body"])
+        )
+
+    def request(
+        self, get_session: Callable, method: str, url: str, key: str = None, **kwargs
+    ):
+        """
+        Returns the async context manager for this request, like session.request().
+
+        Parameters
+        ----------
+        get_session : Callable
+            Returns the aiohttp.ClientSession for real requests.
+        method : str
+            The HTTP method.
+        url : str
+            The URL of the request.
+        key : str, optional
+            Extra part of the cassette name, by default None.
+        **kwargs
+            Passed to session.request().
+
+        Returns
+        -------
+        The async context manager that gives the response.
+        """
+
+        if self.mode is None:
+            return get_session().request(method, url, **kwargs)
+
+        return CassetteRequest(self, get_session, method, url, key, kwargs)
+
+    def ws_connect(self, get_session: Callable, url: str, key: str = None, **kwargs):
+        """
+        Returns the async context manager for this websocket, like session.ws_connect().
+
+        Parameters
+        ----------
+        get_session : Callable
+            Returns the aiohttp.ClientSession for real websockets.
+        url : str
+            The URL of the websocket.
+        key : str, optional
+            Extra part of the cassette name, for websockets that share a URL, by default None.
+        **kwargs
+            Passed to session.ws_connect().
+
+        Returns
+        -------
+        The async context manager that gives the websocket.
+        """
+
+        if self.mode is None:
+            return get_session().ws_connect(url, **kwargs)
+
+        return CassetteWebSocket(self, get_session, url, key, kwargs)
@@ -0,0 +1,152 @@
+## > Imports
+# > Standard libaries
+from __future__ import annotations
+import time
+
+
+class CircuitBreaker:
+    """
+    Keeps track of the health of an upstream provider, so callers can skip it while it is down.
+    After max_failures failed or slow calls in a row the breaker opens and all calls are skipped.
+    Once the cooldown has passed a single probe call is allowed (half-open),
+    if it succeeds the breaker closes again, otherwise it stays open for another cooldown.
+
+    Methods
+    -------
+    available() -> bool:
+        Returns False if the provider should be skipped, without using the probe.
+    allow() -> bool:
+        Returns True if a call may be made now, in half-open state only one probe is allowed.
+    record(success: bool, latency: float = 0) -> None:
+        Records the outcome of a call that was allowed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_failures: int = 3,
+        max_latency: float = 10,
+        cooldown: float = 60,
+    ) -> None:
+        self.name = name
+        self.max_failures = max_failures
+        self.max_latency = max_latency
+        self.cooldown = cooldown
+
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = None
+
+    def set_state(self, state: str) -> None:
+        """
+        Changes the state of the breaker and logs the transition.
+
+        Parameters
+        ----------
+        state : str
+            Either "closed", "open" or "half-open".
+
+        Returns
+        -------
+        None
+        """
+
+        if state != self.state:
+            print(
+                f"Circuit breaker for {self.name} changed from {self.state} to {state}"
+            )
+            self.state = state
+
+    def available(self) -> bool:
+        """
+        Returns False if the provider should be skipped, without using the probe.
+
+        Returns
+        -------
+        bool
+            False if the breaker is open and the cooldown has not passed yet.
+        """
+
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+            self.set_state("half-open")
+
+        return self.state != "open"
+
+    def allow(self) -> bool:
+        """
+        Returns True if a call may be made now, in half-open state only one probe is allowed.
+
+        Returns
+        -------
+        bool
+            True if the call may be made, the outcome should then be passed to record().
+        """
+
+        if not self.available():
+            return False
+
+        if self.state == "half-open":
+            # Allow a new probe if the last one never reported back
+            if (
+                self.probe_started is not None
+                and time.monotonic() - self.probe_started < self.cooldown
+            ):
+                return False
+            self.probe_started = time.monotonic()
+
+        return True
+
+    def record(self, success: bool, latency: float = 0) -> None:
+        """
+        Records the outcome of a call that was allowed.
+        Calls slower than max_latency count as failures.
+
+        Parameters
+        ----------
+        success : bool
+            True if the provider answered.
+        latency : float, optional
+            The duration of the call in seconds, by default 0.
+
+        Returns
+        -------
+        None
+        """
+
+        self.probe_started = None
+
+        if success and latency <= self.max_latency:
+            self.failures = 0
+            self.set_state("closed")
+            return
+
+        self.failures += 1
+
+        if self.state == "half-open" or self.failures >= self.max_failures:
+            self.opened_at = time.monotonic()
+            self.set_state("open")
+
+
+# One breaker per upstream provider used for quotes
+breakers = {
+    "coingecko": CircuitBreaker("CoinGecko"),
+    "yahoo": CircuitBreaker("Yahoo Finance"),
+    "tradingview": CircuitBreaker("TradingView"),
+}
+
+
+def breaker_status() -> dict:
+    """
+    Returns the current state of all circuit breakers, for instance for logging.
+
+    Returns
+    -------
+    dict
+        Maps provider -> {"state": str, "failures": int}.
+    """
+
+    return {
+        provider: {"state": breaker.state, "failures": breaker.failures}
+        for provider, breaker in breakers.items()
+    }
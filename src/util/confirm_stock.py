@@ -1,17 +1,19 @@
 ## > Imports
 
 # > 3rd Party Dependencies
-import yfinance as yf
 from discord.ext import commands
 
+# Local dependencies
+from util.yf_info import get_yf_price
+
 
 async def confirm_stock(bot: commands.Bot, ctx: commands.Context, ticker: str) -> bool:
 
-    # Check if this ticker exists
-    stock_info = yf.Ticker(ticker)
+    # Check if this ticker exists, if Yahoo Finance can not be reached it is handled the same
+    price = await get_yf_price(ticker)
 
     # If it does not exist let the user know
-    if stock_info.info["regularMarketPrice"] == None:
+    if price == None:
         confirm_msg = await ctx.send(
             (
                 f"Are you sure {ticker} is correct? We could not find it on Yahoo Finance.\n"
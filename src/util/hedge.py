@@ -0,0 +1,169 @@
+## > Imports
+# > Standard libaries
+from __future__ import annotations
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+
+class LatencyTracker:
+    """
+    Remembers the most recent latencies per source, used to decide when to hedge a request.
+
+    Methods
+    -------
+    record(source: str, latency: float) -> None:
+        Adds a latency measurement of this source.
+    percentile(source: str, q: float = 0.9) -> float:
+        Returns the q-th percentile of the recorded latencies of this source.
+    """
+
+    def __init__(
+        self,
+        window: int = 100,
+        min_samples: int = 10,
+        default: float = 2,
+        min_delay: float = 0.05,
+        max_delay: float = 10,
+    ) -> None:
+        self.window = window
+        self.min_samples = min_samples
+        self.default = default
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.samples = {}
+
+    def record(self, source: str, latency: float) -> None:
+        """
+        Adds a latency measurement of this source.
+
+        Parameters
+        ----------
+        source : str
+            The name of the source, for instance "yahoo".
+        latency : float
+            The duration of the request in seconds.
+
+        Returns
+        -------
+        None
+        """
+
+        if source not in self.samples:
+            self.samples[source] = deque(maxlen=self.window)
+        self.samples[source].append(latency)
+
+    def percentile(self, source: str, q: float = 0.9) -> float:
+        """
+        Returns the q-th percentile of the recorded latencies of this source.
+        Until enough samples are recorded the default is returned.
+
+        Parameters
+        ----------
+        source : str
+            The name of the source.
+        q : float, optional
+            The percentile as a fraction, by default 0.9.
+
+        Returns
+        -------
+        float
+            The latency in seconds, clamped between min_delay and max_delay.
+        """
+
+        samples = self.samples.get(source, ())
+
+        if len(samples) < self.min_samples:
+            return self.default
+
+        ordered = sorted(samples)
+        value = ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+        return min(self.max_delay, max(self.min_delay, value))
+
+
+latencies = LatencyTracker()
+
+
+async def timed(source: str, coro: Awaitable) -> Any:
+    """
+    Awaits the coroutine and records how long it took.
+    Requests that fail or are cancelled because they lost the race are recorded with the time they ran,
+    otherwise only the fast requests would count and the p90 would be too low.
+
+    Parameters
+    ----------
+    source : str
+        The name of the source to record the latency for.
+    coro : Awaitable
+        The request to await.
+
+    Returns
+    -------
+    Any
+        The result of the coroutine.
+    """
+
+    start = time.monotonic()
+    try:
+        return await coro
+    finally:
+        latencies.record(source, time.monotonic() - start)
+
+
+async def hedged_request(
+    primary: Callable[[], Awaitable],
+    secondary: Callable[[], Awaitable],
+    primary_name: str,
+    secondary_name: str,
+) -> Any:
+    """
+    Starts the primary request and, if it did not answer within its p90 latency,
+    also starts the secondary request. The first useful answer is returned and the other request is cancelled.
+    If the primary answers without a result, the secondary is started right away.
+
+    Parameters
+    ----------
+    primary : Callable[[], Awaitable]
+        Function that starts the primary request.
+    secondary : Callable[[], Awaitable]
+        Function that starts the secondary request.
+    primary_name : str
+        Name of the primary source, used for its latencies.
+    secondary_name : str
+        Name of the secondary source, used for its latencies.
+
+    Returns
+    -------
+    Any
+        The first result that is not None or False, otherwise None.
+    """
+
+    tasks = [asyncio.ensure_future(timed(primary_name, primary()))]
+
+    try:
+        # Give the primary its usual time to answer
+        done, pending = await asyncio.wait(
+            tasks, timeout=latencies.percentile(primary_name)
+        )
+
+        for task in done:
+            if not task.exception() and task.result():
+                return task.result()
+
+        tasks.append(asyncio.ensure_future(timed(secondary_name, secondary())))
+        pending.add(tasks[-1])
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if not task.exception() and task.result():
+                    return task.result()
+    finally:
+        # Cancel the request that lost the race
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,69 @@
+## > Imports
+# > Standard libaries
+from __future__ import annotations
+import json
+import sys
+import time
+
+# The fastest installed JSON library is used, the standard library is the fallback
+# Each backend is (name, loads, dumps), dumps always gives compact output
+backends = [("json", json.loads, lambda obj: json.dumps(obj, separators=(",", ":")))]
+
+try:
+    import ujson
+
+    backends.insert(
+        0,
+        (
+            "ujson",
+            ujson.loads,
+            lambda obj: ujson.dumps(obj, escape_forward_slashes=False),
+        ),
+    )
+except ImportError:
+    pass
+
+try:
+    import orjson
+
+    backends.insert(0, ("orjson", orjson.loads, lambda obj: orjson.dumps(obj).decode()))
+except ImportError:
+    pass
+
+backend, loads, dumps = backends[0]
+
+
+def benchmark(paths: list, rounds: int = 20) -> None:
+    """
+    Compares the decoding speed of all installed JSON backends on the given payloads.
+    Run it as: python -m util.json_codec payload1.json payload2.json ...
+
+    Parameters
+    ----------
+    paths : list
+        Paths to files with recorded JSON payloads.
+    rounds : int, optional
+        How often each payload is decoded per backend, by default 20.
+
+    Returns
+    -------
+    None
+    """
+
+    payloads = []
+    for path in paths:
+        with open(path, "rb") as f:
+            payloads.append((path, f.read()))
+
+    for path, payload in payloads:
+        print(f"{path} ({len(payload) / 1000:.1f} kB)")
+        for name, backend_loads, _ in backends:
+            start = time.perf_counter()
+            for _ in range(rounds):
+                backend_loads(payload)
+            duration = (time.perf_counter() - start) / rounds * 1000
+            print(f"  {name:<8}{duration:8.3f} ms")
+
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1:])
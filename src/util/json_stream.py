@@ -0,0 +1,185 @@
+## > Imports
+# > Standard libaries
+from __future__ import annotations
+import codecs
+import json
+import re
+from typing import Any, List, Optional
+
+# The characters that change the structure of a JSON document
+STRUCTURE = re.compile(r'[\[\]{}",:]')
+
+# The rest of a JSON string, starting right after the opening quote
+STRING_END = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+
+# Skips whitespace between array elements
+WHITESPACE = re.compile(r"\s*")
+
+# Decodes a single element, the C scanner of the standard library does the heavy lifting
+decoder = json.JSONDecoder()
+
+
+class JSONArrayStream:
+    """
+    Incremental parser that yields the elements of one array in a JSON document as the bytes arrive.
+    Only the array elements are decoded, one at a time, and only the requested fields are kept.
+    This avoids building the whole document in memory for large responses.
+
+    Methods
+    -------
+    feed(chunk: bytes) -> List[Any]:
+        Adds the next chunk of the document and returns the elements that are now complete.
+    """
+
+    def __init__(self, key: Optional[str] = None, fields: List[str] = None) -> None:
+        # The key of the array in the top-level object, None if the document itself is the array
+        self.key = key
+        self.fields = fields
+
+        # Chunks can end in the middle of a multi-byte character
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+
+        # "seek" until the array is found, then "array" and finally "done"
+        self.state = "seek"
+
+        # Used to recognize the key of the array in the top-level object
+        self.last_string = None
+        self.key_found = False
+
+    def project(self, element: Any) -> Any:
+        """
+        Keeps only the requested fields of the element.
+
+        Parameters
+        ----------
+        element : Any
+            The decoded array element.
+
+        Returns
+        -------
+        Any
+            The element with only the requested fields, if it is an object.
+        """
+
+        if self.fields is None or not isinstance(element, dict):
+            return element
+        return {field: element.get(field) for field in self.fields}
+
+    def seek(self) -> None:
+        """
+        Scans the document until the start of the array, skipping everything in front of it.
+
+        Returns
+        -------
+        None
+        """
+
+        while True:
+            match = STRUCTURE.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+                return
+
+            char = match.group()
+
+            if char == '"':
+                end = STRING_END.match(self.buffer, match.end())
+                if end is None:
+                    # The string continues in the next chunk
+                    self.pos = match.start()
+                    return
+                if self.depth == 1:
+                    self.last_string = self.buffer[match.end() : end.end() - 1]
+                self.pos = end.end()
+                continue
+
+            self.pos = match.end()
+
+            if char == ":" and self.depth == 1:
+                self.key_found = self.last_string == self.key
+            elif char in "[{":
+                self.depth += 1
+                if char == "[" and (
+                    self.key_found or (self.key is None and self.depth == 1)
+                ):
+                    self.state = "array"
+                    return
+                self.key_found = False
+            elif char in "]}":
+                self.depth -= 1
+            elif char == ",":
+                self.key_found = False
+
+    def read_elements(self) -> List[Any]:
+        """
+        Decodes the complete array elements in the buffer.
+
+        Returns
+        -------
+        List[Any]
+            The decoded and projected elements.
+        """
+
+        elements = []
+
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos >= len(self.buffer):
+                return elements
+
+            char = self.buffer[self.pos]
+            if char == ",":
+                self.pos += 1
+                continue
+            if char == "]":
+                self.state = "done"
+                return elements
+
+            try:
+                element, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The element continues in the next chunk
+                return elements
+
+            # A number is only complete once the character after it is known, "1." could become "1.5"
+            if not isinstance(element, (dict, list, str)) and (
+                end == len(self.buffer) or self.buffer[end] not in " \t\r\n,]"
+            ):
+                return elements
+
+            elements.append(self.project(element))
+            self.pos = end
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Adds the next chunk of the document and returns the elements that are now complete.
+
+        Parameters
+        ----------
+        chunk : bytes
+            The next part of the JSON document.
+
+        Returns
+        -------
+        List[Any]
+            The elements of the array that were completed by this chunk.
+        """
+
+        if self.state == "done":
+            return []
+
+        self.buffer += self.text_decoder.decode(chunk)
+
+        if self.state == "seek":
+            self.seek()
+
+        elements = self.read_elements() if self.state == "array" else []
+
+        # Drop everything that has been processed
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+
+        return elements
@@ -0,0 +1,160 @@
+## > Imports
+# > Standard libaries
+from __future__ import annotations
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+# Local dependencies
+from util.vars import config
+
+# How old in seconds a quote may be if the caller does not say otherwise
+default_max_age = (config.get("QUOTES", {}) or {}).get("MAX_AGE", 30)
+
+
+class QuoteService:
+    """
+    Keeps the latest quote per venue and symbol, so all cogs share the prices they request.
+    Callers ask for a quote no older than max_age seconds, only on a miss the network is used.
+    The quote is whatever the fetch function of that venue returns, for instance a price or a tuple.
+
+    Methods
+    -------
+    peek(venue: str, symbol: Hashable, max_age: float = None) -> Optional[Any]:
+        Returns the stored quote if it is recent enough, without fetching.
+    put(venue: str, symbol: Hashable, quote: Any) -> None:
+        Stores a quote, for instance one that was pushed by a websocket.
+    get(venue: str, symbol: Hashable, fetch: Callable[[], Awaitable], max_age: float = None) -> Any:
+        Returns a quote no older than max_age seconds, fetching it if needed.
+    """
+
+    def __init__(self) -> None:
+        # (venue, symbol) -> (monotonic timestamp, quote)
+        self.quotes = {}
+        # (venue, symbol) -> task of the running fetch
+        self.inflight = {}
+        # (venue, symbol) -> number of callers waiting for the running fetch
+        self.waiters = {}
+        self.stats = {"hits": 0, "misses": 0}
+
+    def peek(
+        self, venue: str, symbol: Hashable, max_age: float = None
+    ) -> Optional[Any]:
+        """
+        Returns the stored quote if it is recent enough, without fetching.
+
+        Parameters
+        ----------
+        venue : str
+            Where the quote comes from, for instance "binance".
+        symbol : Hashable
+            The symbol of the quote at this venue.
+        max_age : float, optional
+            The maximum age of the quote in seconds, by default default_max_age.
+
+        Returns
+        -------
+        Optional[Any]
+            The quote, or None if there is no recent enough quote.
+        """
+
+        if max_age is None:
+            max_age = default_max_age
+
+        entry = self.quotes.get((venue, symbol))
+
+        if entry is None or time.monotonic() - entry[0] > max_age:
+            return None
+        return entry[1]
+
+    def put(self, venue: str, symbol: Hashable, quote: Any) -> None:
+        """
+        Stores a quote, for instance one that was pushed by a websocket.
+
+        Parameters
+        ----------
+        venue : str
+            Where the quote comes from, for instance "binance".
+        symbol : Hashable
+            The symbol of the quote at this venue.
+        quote : Any
+            The quote.
+
+        Returns
+        -------
+        None
+        """
+
+        self.quotes[(venue, symbol)] = (time.monotonic(), quote)
+
+    async def get(
+        self,
+        venue: str,
+        symbol: Hashable,
+        fetch: Callable[[], Awaitable],
+        max_age: float = None,
+    ) -> Any:
+        """
+        Returns a quote no older than max_age seconds, fetching it if needed.
+        Concurrent requests for the same quote share one fetch.
+        The fetch is cancelled once all callers that wait for it are cancelled.
+        Empty results (None, False or 0) are returned but not stored.
+
+        Parameters
+        ----------
+        venue : str
+            Where the quote comes from, for instance "binance".
+        symbol : Hashable
+            The symbol of the quote at this venue.
+        fetch : Callable[[], Awaitable]
+            Function that requests the quote from the venue.
+        max_age : float, optional
+            The maximum age of the quote in seconds, by default default_max_age.
+
+        Returns
+        -------
+        Any
+            The quote.
+        """
+
+        if (quote := self.peek(venue, symbol, max_age)) is not None:
+            self.stats["hits"] += 1
+            return quote
+
+        self.stats["misses"] += 1
+        key = (venue, symbol)
+
+        if key not in self.inflight:
+            task = asyncio.ensure_future(fetch())
+            self.inflight[key] = task
+
+            def done(task: asyncio.Task) -> None:
+                # A newer fetch may have replaced this one, if it was cancelled
+                if self.inflight.get(key) is task:
+                    del self.inflight[key]
+                if not task.cancelled() and not task.exception() and task.result():
+                    self.put(venue, symbol, task.result())
+
+            task.add_done_callback(done)
+
+        task = self.inflight[key]
+        self.waiters[key] = self.waiters.get(key, 0) + 1
+
+        try:
+            # Shield the shared fetch, so a cancelled caller does not cancel it for the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Nobody else needs the quote, so stop the fetch
+            # It is removed right away, so a caller that comes in later starts a new fetch instead of joining this one
+            if self.waiters[key] == 1:
+                task.cancel()
+                if self.inflight.get(key) is task:
+                    del self.inflight[key]
+            raise
+        finally:
+            self.waiters[key] -= 1
+            if self.waiters[key] == 0:
+                del self.waiters[key]
+
+
+quotes = QuoteService()
@@ -0,0 +1,128 @@
+## > Imports
+# > Standard libaries
+from __future__ import annotations
+import asyncio
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """
+    Async token bucket, requests that do not fit in the budget wait in line instead of failing.
+    Waiters are served in the order they arrived, since asyncio.Lock is fair.
+
+    Methods
+    -------
+    acquire(weight: int = 1) -> None:
+        Waits until there are enough tokens for a request of this weight.
+    """
+
+    def __init__(self, requests: float, per: float) -> None:
+        # Allow a full burst of requests, then refill at the steady rate
+        self.capacity = requests
+        self.rate = requests / per
+        self.tokens = requests
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+        # Number of requests waiting for tokens and how long the last one waited
+        self.queued = 0
+        self.last_wait = 0.0
+
+    async def acquire(self, weight: int = 1) -> None:
+        """
+        Waits until there are enough tokens for a request of this weight.
+
+        Parameters
+        ----------
+        weight : int, optional
+            The weight of the request, for instance Binance counts some endpoints as multiple requests, by default 1.
+
+        Returns
+        -------
+        None
+        """
+
+        start = time.monotonic()
+        self.queued += 1
+
+        try:
+            async with self.lock:
+                # Refill the bucket based on the passed time
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+
+                # Wait until the missing tokens have been refilled
+                if self.tokens < weight:
+                    await asyncio.sleep((weight - self.tokens) / self.rate)
+                    self.tokens = weight
+                    self.updated = time.monotonic()
+
+                self.tokens -= weight
+        finally:
+            self.queued -= 1
+            self.last_wait = time.monotonic() - start
+
+
+class RateLimiter:
+    """
+    Keeps one TokenBucket per host, shared by all cogs.
+    Hosts without a configured limit are not limited.
+
+    Methods
+    -------
+    acquire(url: str, weight: int = 1) -> None:
+        Waits until the host of the url allows a request of this weight.
+    status() -> dict:
+        Returns the current queue depth and last wait time per host.
+    """
+
+    def __init__(self, limits: dict) -> None:
+        # Maps host -> (requests, per seconds)
+        self.limits = limits
+        # The buckets are made on first use, inside the running event loop
+        self.buckets = {}
+
+    async def acquire(self, url: str, weight: int = 1) -> None:
+        """
+        Waits until the host of the url allows a request of this weight.
+
+        Parameters
+        ----------
+        url : str
+            The URL of the request, or just the host.
+        weight : int, optional
+            The weight of the request, by default 1.
+
+        Returns
+        -------
+        None
+        """
+
+        host = urlparse(url).netloc or url
+
+        if host not in self.limits:
+            return
+
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(*self.limits[host])
+
+        await self.buckets[host].acquire(weight)
+
+    def status(self) -> dict:
+        """
+        Returns the current queue depth and last wait time per host.
+
+        Returns
+        -------
+        dict
+            Maps host -> {"queued": int, "wait": float}.
+        """
+
+        return {
+            host: {"queued": bucket.queued, "wait": round(bucket.last_wait, 3)}
+            for host, bucket in self.buckets.items()
+        }
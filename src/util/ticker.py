@@ -1,31 +1,211 @@
 ##> Imports
 # > Standard libaries
 from __future__ import annotations
+import asyncio
+import time
 import traceback
 from typing import Optional, List
 
-# > 3rd Party Dependencies
-import yfinance as yf
-
 # Local dependencies
-from util.tv_data import TV_data
-from util.vars import stables, cg_coins, cg
+from util.tv_data import tv
+from util.vars import config, stables, get_cg_coins, get_cg_best_id, get_json_data
+from util.cache import TTLCache
 from util.afterhours import afterHours
+from util.circuit_breaker import breakers
+from util.hedge import hedged_request
+from util.yf_info import get_yf_info, has_yf_info
+from util.quotes import quotes
+from util.ticker_cache import get_classification, set_classification
+
+# Remembers (asset, symbol) pairs that did not match any coin or stock, since most hashtags are not tickers
+negative_cache = TTLCache(max_entries=config.get("NEGATIVE_CACHE_ENTRIES", 2048))
+negative_ttl = config.get("NEGATIVE_CACHE_TTL", 15 * 60)
+
+# "saved" is the number of lookups that were skipped because of the negative cache
+lookup_stats = {"saved": 0}
+
+
+def is_unresolvable(asset: str, ticker: str) -> bool:
+    """
+    Checks if the ticker recently did not match anything of this asset class.
+
+    Parameters
+    ----------
+    asset : str
+        The asset class, either "crypto" or "stock".
+    ticker : str
+        The ticker of the coin or stock.
+
+    Returns
+    -------
+    bool
+        True if the lookup can be skipped.
+    """
+
+    if negative_cache.get((asset, ticker), negative_ttl):
+        lookup_stats["saved"] += 1
+        return True
+    return False
+
+
+def stock_candidates(tickers: List[str]) -> List[str]:
+    """
+    Returns the tickers that could be stocks, to request their quotes in advance.
+    Tickers that recently did not match a stock or that are saved as crypto are left out.
+
+    Parameters
+    ----------
+    tickers : List[str]
+        The tickers of the coins or stocks.
+
+    Returns
+    -------
+    List[str]
+        The tickers that may be stocks.
+    """
+
+    candidates = []
+
+    for ticker in tickers:
+        if negative_cache.get(("stock", ticker), negative_ttl):
+            continue
+
+        classification = get_classification(ticker)
+        if classification is not None and classification[0] == "crypto":
+            continue
+
+        candidates.append(ticker)
+
+    return candidates
+
+
+async def get_coin_markets(ids: List[str]) -> dict:
+    """
+    Gets the market data of many coins at once, respecting the circuit breaker.
+    This is a lot smaller than the full coin information, which includes every exchange ticker.
+
+    Parameters
+    ----------
+    ids : List[str]
+        The CoinGecko ids of the coins.
+
+    Returns
+    -------
+    dict
+        Maps the id to its market data (current_price, total_volume, price_change_percentage_24h, ...).
+        Empty if CoinGecko is down or returned an error.
+    """
+
+    breaker = breakers["coingecko"]
+
+    if not ids or not breaker.allow():
+        return {}
+
+    markets = []
+    start = time.monotonic()
+
+    # At most 250 coins fit in one page
+    for i in range(0, len(ids), 250):
+        try:
+            data = await get_json_data(
+                "https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&per_page=250&ids="
+                + ",".join(ids[i : i + 250]),
+                max_age=60,
+            )
+        except Exception as e:
+            print(f"CoinGecko API error for {ids}. Error:", e)
+            breaker.record(False)
+            return {}
+
+        # Errors are returned as a dict
+        if not isinstance(data, list):
+            print(f"CoinGecko API error for {ids}. Error:", data)
+            breaker.record(False)
+            return {}
+
+        markets += data
+
+    breaker.record(True, time.monotonic() - start)
+    return {coin["id"]: coin for coin in markets}
+
 
-tv = TV_data()
+async def get_coin_exchanges(coin_id: str) -> List[str]:
+    """
+    Gets the names of the exchanges with an emoji (Binance and KuCoin) that list this coin.
+    Only needed when a coin is shown in an embed, so it is not part of fetch_coin_info().
+
+    Parameters
+    ----------
+    coin_id : str
+        The CoinGecko id of the coin.
+
+    Returns
+    -------
+    List[str]
+        The exchange names, for instance ["Binance", "KuCoin"].
+        Empty if CoinGecko is down or returned an error.
+    """
+
+    breaker = breakers["coingecko"]
+
+    if not breaker.available():
+        return []
+
+    try:
+        data = await get_json_data(
+            f"https://api.coingecko.com/api/v3/coins/{coin_id}/tickers?exchange_ids=binance,kucoin",
+            max_age=60 * 60,
+        )
+        return list({ticker["market"]["name"] for ticker in data.get("tickers", [])})
+    except Exception as e:
+        print(f"CoinGecko API error for the exchanges of {coin_id}. Error:", e)
+        breaker.record(False)
+        return []
 
 
 async def get_coin_info(
-    ticker: str,
+    ticker: str, coin_id: str = None, max_age: float = None
 ) -> Optional[tuple[float, str, List[str], float, str]]:
     """
     Gets the volume, website, exchanges, price, and change of the coin.
+    The quote is shared with the other cogs, it is only requested if it is older than max_age seconds.
+
+    Parameters
+    ----------
+    ticker : str
+        The ticker of the coin.
+    coin_id : str, optional
+        The CoinGecko id of the coin if it is already known, by default None.
+    max_age : float, optional
+        The maximum age of the quote in seconds, by default the QUOTES.MAX_AGE setting.
+
+    Returns
+    -------
+    Optional[tuple[float, str, List[str], float, str]]
+        The same as fetch_coin_info().
+    """
+
+    return await quotes.get(
+        "coingecko",
+        (ticker, coin_id),
+        lambda: fetch_coin_info(ticker, coin_id),
+        max_age,
+    )
+
+
+async def fetch_coin_info(
+    ticker: str, coin_id: str = None
+) -> Optional[tuple[float, str, List[str], float, str]]:
+    """
+    Requests the volume, website, exchanges, price, and change of the coin.
     This can only be called maximum 50 times per minute.
 
     Parameters
     ----------
     ticker : str
         The ticker of the coin.
+    coin_id : str, optional
+        The CoinGecko id of the coin if it is already known, by default None.
 
     Returns
     -------
@@ -34,7 +214,7 @@ async def get_coin_info(
     str
         The website of the coin.
     list[str]
-        The exchanges of the coin.
+        The exchanges of the coin, None if they can be requested using get_coin_exchanges().
     float
         The price of the coin.
     str
@@ -47,120 +227,73 @@ async def get_coin_info(
             if ticker.endswith(stable):
                 ticker = ticker[: -len(stable)]
 
-    # Get the id of the ticker
-    # Check if the symbol exists
-    if ticker in cg_coins["symbol"].values:
-        ids = cg_coins[cg_coins["symbol"] == ticker]["id"]
-        if len(ids) > 1:
-            id = None
-            best_vol = 0
-            coin_dict = None
-            for symbol in ids.values:
-                # Catch potential errors
-                try:
-                    coin_info = cg.get_coin_by_id(symbol)
-                    if "usd" in coin_info["market_data"]["total_volume"]:
-                        volume = coin_info["market_data"]["total_volume"]["usd"]
-                        if volume > best_vol:
-                            best_vol = volume
-                            id = symbol
-                            coin_dict = coin_info
-                except Exception as e:
-                    pass
-
-        elif len(ids) == 1:
-            id = ids.values[0]
-            # Try in case the CoinGecko API does not work
-            try:
-                coin_dict = cg.get_coin_by_id(id)
-            except Exception:
-                return
+    # This symbol did not match a coin a moment ago
+    if coin_id is None and is_unresolvable("crypto", ticker):
+        return None
 
-        else:
-            return
+    # Skip CoinGecko while it is down
+    coingecko = breakers["coingecko"].available()
 
-    # As a second options check the TradingView data
-    elif tv_data := await tv.get_tv_data(ticker, "crypto"):
-        price, perc_change, volume, exchange = tv_data
-        formatted_change = (
-            f"+{perc_change}% 📈" if perc_change > 0 else f"{perc_change}% 📉"
-        )
-        website = f"https://www.tradingview.com/symbols/{ticker}-{exchange}/?coingecko"
-        return volume, website, exchange, price, formatted_change
-
-    elif ticker.lower() in cg_coins["id"].values:
-        ids = cg_coins[cg_coins["id"] == ticker.lower()]["id"]
-        if len(ids) > 1:
-            id = None
-            best_vol = 0
-            coin_dict = None
-            for symbol in ids.values:
-                coin_info = cg.get_coin_by_id(symbol)
-                if "usd" in coin_info["market_data"]["total_volume"]:
-                    volume = coin_info["market_data"]["total_volume"]["usd"]
-                    if volume > best_vol:
-                        best_vol = volume
-                        id = symbol
-                        coin_dict = coin_info
-
-        elif len(ids) == 1:
-            id = ids.values[0]
-            try:
-                coin_dict = cg.get_coin_by_id(id)
-            except Exception:
-                return
+    # Use the same coins list for the whole lookup
+    cg_coins = get_cg_coins()
 
-        else:
-            return
-
-    elif ticker in cg_coins["name"].values:
-        ids = cg_coins[cg_coins["name"] == ticker]["id"]
-        if len(ids) > 1:
-            id = None
-            best_vol = 0
-            coin_dict = None
-            for symbol in ids.values:
-                coin_info = cg.get_coin_by_id(symbol)
-                if "usd" in coin_info["market_data"]["total_volume"]:
-                    volume = coin_info["market_data"]["total_volume"]["usd"]
-                    if volume > best_vol:
-                        best_vol = volume
-                        id = symbol
-                        coin_dict = coin_info
-
-        elif len(ids) == 1:
-            id = ids.values[0]
-            try:
-                coin_dict = cg.get_coin_by_id(id)
-            except Exception:
-                return
+    # Get the ids matching the symbol, unless the id is already known
+    if coin_id is not None:
+        ids = [coin_id] if coingecko else []
+    else:
+        ids = cg_coins.ids_by_symbol(ticker) if coingecko else []
+
+        # Symbols of multiple coins are resolved in the background
+        if len(ids) > 1 and (best_id := get_cg_best_id(ticker)) in ids:
+            ids = [best_id]
+
+    if not ids:
+        # As a second options check the TradingView data
+        if tv_data := await tv.get_tv_data(ticker, "crypto"):
+            price, perc_change, volume, exchange = tv_data
+            formatted_change = (
+                f"+{perc_change}% 📈" if perc_change > 0 else f"{perc_change}% 📉"
+            )
+            website = (
+                f"https://www.tradingview.com/symbols/{ticker}-{exchange}/?coingecko"
+            )
+            return volume, website, exchange, price, formatted_change
+
+        # Otherwise try it as CoinGecko id or name
+        if coingecko:
+            if ticker.lower() in cg_coins:
+                ids = [ticker.lower()]
+            else:
+                ids = cg_coins.ids_by_name(ticker)
+
+    if not ids:
+        # No coin matched, unless CoinGecko or TradingView could not be asked
+        # TradingView is skipped while it is down or its symbols are not downloaded yet
+        tradingview = breakers["tradingview"].available() and tv.loaded["crypto"]
+        if coingecko and tradingview:
+            negative_cache.set(("crypto", ticker), True)
+        return
 
-        else:
-            return
+    # Get all candidates in one request, the one with the most volume is used
+    markets = await get_coin_markets(ids)
 
-    else:
+    if not markets:
+        print(f"Could not get coingecko info for {ticker}")
         return
 
+    coin_dict = max(markets.values(), key=lambda coin: coin["total_volume"] or 0)
+
     # Get the information of this coin
     try:
-        website = f"https://coingecko.com/en/coins/{id}"
+        website = f"https://coingecko.com/en/coins/{coin_dict['id']}"
 
         # For tokens that are previewed but not yet live
-        if coin_dict is None:
-            print(f"Could not get coingecko info for {ticker}")
-            return
-
-        if coin_dict["market_data"] is None:
-            print(f"Could not get coingecko info for {ticker}")
-            return
-
-        if "usd" in coin_dict["market_data"]["total_volume"].keys():
-            total_vol = coin_dict["market_data"]["total_volume"]["usd"]
-        else:
+        if coin_dict["total_volume"] is None:
             return 1, website, [], 0, "Preview Only"
 
-        price = coin_dict["market_data"]["current_price"]["usd"]
-        price_change = coin_dict["market_data"]["price_change_percentage_24h"]
+        total_vol = coin_dict["total_volume"]
+        price = coin_dict["current_price"]
+        price_change = coin_dict["price_change_percentage_24h"]
 
         if price_change != None:
             change = round(price_change, 2)
@@ -168,26 +301,21 @@ async def get_coin_info(
             return total_vol, website, [], price, "?"
 
         formatted_change = f"+{change}% 📈" if change > 0 else f"{change}% 📉"
-
-        # Get the exchanges
-        exchanges = [exchange["market"]["name"] for exchange in coin_dict["tickers"]]
     except Exception as e:
         print(traceback.format_exc())
         print(f"CoinGecko API error for {ticker}. Error:", e)
         return None
 
-    # Get the exchanges
-    exchanges = [exchange["market"]["name"] for exchange in coin_dict["tickers"]]
-
-    # Return the information
-    return total_vol, website, exchanges, price, formatted_change
+    # The exchanges are only requested when needed, see get_coin_exchanges()
+    return total_vol, website, None, price, formatted_change
 
 
-async def get_stock_info(
+async def get_yf_stock_info(
     ticker: str,
-) -> Optional[tuple[float, str, List[str], float, str]]:
+) -> Optional[tuple[float, str, str, List[float], List[str]]]:
     """
-    Gets the volume, website, exchanges, price, and change of the stock.
+    Gets the volume, website, exchange, prices, and changes of the stock from Yahoo Finance.
+    During after-hours the pre-market price and change are included as well.
 
     Parameters
     ----------
@@ -196,23 +324,40 @@ async def get_stock_info(
 
     Returns
     -------
-    Optional[tuple[float, str, List[str], float, str]]
+    Optional[tuple[float, str, str, List[float], List[str]]]
+        None if Yahoo Finance answered without a quote, False if it could not be asked or failed.
         float
             The volume of the stock.
         str
             The website of the stock.
-        list[str]
-            The exchanges of the stock.
-        float
-            The price of the stock.
         str
-            The 24h price change of the stock.
+            The exchange of the stock.
+        List[float]
+            The prices of the stock.
+        List[str]
+            The 24h price changes of the stock.
     """
 
-    stock_info = yf.Ticker(ticker)
+    info = None
+    breaker = breakers["yahoo"]
+
+    # Skip Yahoo Finance while it is down
+    if breaker.allow():
+        start = time.monotonic()
+        try:
+            # yfinance is blocking, so it runs in the Yahoo Finance threads
+            info = await get_yf_info(ticker)
+            breaker.record(True, time.monotonic() - start)
+        except Exception as e:
+            print(f"Yahoo Finance error for {ticker}. Error:", e)
+            breaker.record(False)
+
+    # Yahoo Finance is down, so this says nothing about the ticker
+    if info is None:
+        return False
 
     try:
-        if stock_info.info["regularMarketPrice"] != None:
+        if info["regularMarketPrice"] != None:
 
             prices = []
             changes = []
@@ -221,13 +366,13 @@ async def get_stock_info(
             if afterHours():
                 # Use bid if premarket price is not available
                 price = (
-                    round(stock_info.info["preMarketPrice"], 2)
-                    if stock_info.info["preMarketPrice"] != None
-                    else stock_info.info["bid"]
+                    round(info["preMarketPrice"], 2)
+                    if info["preMarketPrice"] != None
+                    else info["bid"]
                 )
                 change = round(
-                    (price - stock_info.info["regularMarketPrice"])
-                    / stock_info.info["regularMarketPrice"]
+                    (price - info["regularMarketPrice"])
+                    / info["regularMarketPrice"]
                     * 100,
                     2,
                 )
@@ -239,10 +384,10 @@ async def get_stock_info(
                     changes.append(formatted_change)
 
             # Could try 'currentPrice' as well
-            price = round(stock_info.info["regularMarketPrice"], 2)
+            price = round(info["regularMarketPrice"], 2)
             change = round(
-                (price - stock_info.info["regularMarketPreviousClose"])
-                / stock_info.info["regularMarketPreviousClose"]
+                (price - info["regularMarketPreviousClose"])
+                / info["regularMarketPreviousClose"]
                 * 100,
                 2,
             )
@@ -254,12 +399,12 @@ async def get_stock_info(
 
             # Return the important information
             # Could also try 'volume' or 'volume24Hr' (is None if market is closed)
-            volume = stock_info.info["regularMarketVolume"] * price
+            volume = info["regularMarketVolume"] * price
 
             return (
                 volume,
                 f"https://finance.yahoo.com/quote/{ticker}",
-                stock_info.info["exchange"],
+                info["exchange"],
                 prices,
                 changes,
             )
@@ -267,19 +412,153 @@ async def get_stock_info(
     except Exception:
         pass
 
-    # Check TradingView data
+
+async def get_tv_stock_info(
+    ticker: str,
+) -> Optional[tuple[float, str, str, List[float], List[str]]]:
+    """
+    Gets the volume, website, exchange, price, and change of the stock from TradingView.
+    The price and change are in lists, the same as get_yf_stock_info().
+
+    Parameters
+    ----------
+    ticker : str
+        The ticker of the stock.
+
+    Returns
+    -------
+    Optional[tuple[float, str, str, List[float], List[str]]]
+        float
+            The volume of the stock.
+        str
+            The website of the stock.
+        str
+            The exchange of the stock.
+        List[float]
+            The price of the stock.
+        List[str]
+            The 24h price change of the stock.
+    """
+
     if tv_data := await tv.get_tv_data(ticker, "stock"):
         price, perc_change, volume, exchange = tv_data
         formatted_change = (
             f"+{perc_change}% 📈" if perc_change > 0 else f"{perc_change}% 📉"
         )
         website = f"https://www.tradingview.com/symbols/{ticker}-{exchange}"
-        return volume, website, exchange, price, formatted_change
+        return volume, website, exchange, [price], [formatted_change]
 
     else:
         return None
 
 
+async def get_stock_info(
+    ticker: str, max_age: float = None
+) -> Optional[tuple[float, str, List[str], float, str]]:
+    """
+    Gets the volume, website, exchanges, price, and change of the stock.
+    The quote is shared with the other cogs, it is only requested if it is older than max_age seconds.
+
+    Parameters
+    ----------
+    ticker : str
+        The ticker of the stock.
+    max_age : float, optional
+        The maximum age of the quote in seconds, by default the QUOTES.MAX_AGE setting.
+
+    Returns
+    -------
+    Optional[tuple[float, str, List[str], float, str]]
+        The same as fetch_stock_info().
+    """
+
+    return await quotes.get("stock", ticker, lambda: fetch_stock_info(ticker), max_age)
+
+
+async def fetch_stock_info(
+    ticker: str,
+) -> Optional[tuple[float, str, List[str], float, str]]:
+    """
+    Requests the volume, website, exchanges, price, and change of the stock.
+    Yahoo Finance is asked first, if it does not answer within its usual (p90) latency
+    TradingView is asked as well and the first answer is used.
+
+    Parameters
+    ----------
+    ticker : str
+        The ticker of the stock.
+
+    Returns
+    -------
+    Optional[tuple[float, str, List[str], float, str]]
+        float
+            The volume of the stock.
+        str
+            The website of the stock.
+        list[str]
+            The exchanges of the stock.
+        float
+            The price of the stock.
+        str
+            The 24h price change of the stock.
+    """
+
+    # This symbol did not match a stock a moment ago
+    if is_unresolvable("stock", ticker):
+        return None
+
+    # The answer of Yahoo Finance, also when TradingView won the race
+    yahoo = {}
+
+    async def yahoo_stock_info():
+        yahoo["result"] = await get_yf_stock_info(ticker)
+        return yahoo["result"]
+
+    # Hedging is only for real requests, cached Yahoo Finance quotes are used directly
+    # This also keeps the cache hits out of the Yahoo Finance latencies
+    if has_yf_info(ticker):
+        stock = await yahoo_stock_info() or await get_tv_stock_info(ticker)
+    else:
+        stock = await hedged_request(
+            yahoo_stock_info,
+            lambda: get_tv_stock_info(ticker),
+            "yahoo",
+            "tradingview",
+        )
+
+    # No stock matched, only if Yahoo Finance answered without a quote and TradingView could be asked
+    tradingview = breakers["tradingview"].available() and tv.loaded["stock"]
+    if stock is None and "result" in yahoo and yahoo["result"] is None and tradingview:
+        negative_cache.set(("stock", ticker), True)
+
+    return stock
+
+
+def save_classification(ticker: str, asset: str, website: str) -> None:
+    """
+    Saves the outcome of classify_ticker(), so the next lookup of this ticker can skip the other asset class.
+
+    Parameters
+    ----------
+    ticker : str
+        The ticker of the coin or stock.
+    asset : str
+        The asset class, either "crypto" or "stock".
+    website : str
+        The website of the coin or stock, the CoinGecko id is taken from it.
+
+    Returns
+    -------
+    None
+    """
+
+    provider_id = None
+    if "coingecko.com/en/coins/" in website:
+        provider_id = website.split("/")[-1]
+
+    set_classification(ticker, asset, provider_id, website)
+
+
 async def classify_ticker(
     ticker: str, majority: str
 ) -> Optional[tuple[float, str, List[str], float, str, str]]:
@@ -310,22 +589,47 @@ async def classify_ticker(
             The technical analysis using TradingView.
     """
 
-    if majority == "crypto" or majority == "🤷‍♂️":
-        coin = await get_coin_info(ticker)
-        # If volume of the crypto is bigger than 1,000,000, it is likely a crypto
-        # Stupid Tessla Coin https://www.coingecko.com/en/coins/tessla-coin
-        if coin is not None:
-            if coin[0] > 1000000 or ticker.endswith("BTC"):
-                ta = tv.get_tv_TA(ticker, "crypto")
+    # Tickers that were classified before only need the lookup of their asset class
+    if classification := get_classification(ticker):
+        asset, provider_id, _ = classification
+        if asset == "crypto":
+            if coin := await get_coin_info(ticker, provider_id):
+                ta = await tv.get_tv_TA(ticker, "crypto")
                 return *coin, ta
-        stock = await get_stock_info(ticker)
-    else:
-        stock = await get_stock_info(ticker)
-        if stock is not None:
-            if stock[0] > 1000000:
-                ta = tv.get_tv_TA(ticker, "stock")
-                return *stock, ta
-        coin = await get_coin_info(ticker)
+        elif stock := await get_stock_info(ticker):
+            ta = await tv.get_tv_TA(ticker, "stock")
+            return *stock, ta
+
+    # Start both lookups at once, so ambiguous tickers only wait for the slowest one
+    coin_task = asyncio.ensure_future(get_coin_info(ticker))
+    stock_task = asyncio.ensure_future(get_stock_info(ticker))
+
+    try:
+        if majority == "crypto" or majority == "🤷‍♂️":
+            coin = await coin_task
+            # If volume of the crypto is bigger than 1,000,000, it is likely a crypto
+            # Stupid Tessla Coin https://www.coingecko.com/en/coins/tessla-coin
+            if coin is not None:
+                if coin[0] > 1000000 or ticker.endswith("BTC"):
+                    stock_task.cancel()
+                    save_classification(ticker, "crypto", coin[1])
+                    ta = await tv.get_tv_TA(ticker, "crypto")
+                    return *coin, ta
+            stock = await stock_task
+        else:
+            stock = await stock_task
+            if stock is not None:
+                if stock[0] > 1000000:
+                    coin_task.cancel()
+                    save_classification(ticker, "stock", stock[1])
+                    ta = await tv.get_tv_TA(ticker, "stock")
+                    return *stock, ta
+            coin = await coin_task
+    finally:
+        # Do not leave a lookup running if the other one failed
+        for task in (coin_task, stock_task):
+            if not task.done():
+                task.cancel()
 
     # First in tuple represents volume
     if coin is None:
@@ -339,10 +643,12 @@ async def classify_ticker(
         stock_vol = stock[0]
 
     if coin_vol > stock_vol and coin_vol > 50000:
-        ta = tv.get_tv_TA(ticker, "crypto")
+        save_classification(ticker, "crypto", coin[1])
+        ta = await tv.get_tv_TA(ticker, "crypto")
         return *coin, ta
     elif coin_vol < stock_vol:
-        ta = tv.get_tv_TA(ticker, "stock")
+        save_classification(ticker, "stock", stock[1])
+        ta = await tv.get_tv_TA(ticker, "stock")
         return *stock, ta
     else:
         return None
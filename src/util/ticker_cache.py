@@ -0,0 +1,205 @@
+## > Imports
+# > Standard libaries
+from __future__ import annotations
+import sqlite3
+import time
+from typing import List, Optional
+
+# > 3rd Party Dependencies
+from discord.ext.tasks import loop
+
+# Local dependencies
+from util.vars import config
+
+# How long in seconds a resolved ticker is trusted, the asset class and exchange rarely change
+ttl = config.get("TICKER_CACHE_TTL", 7 * 24 * 60 * 60)
+
+# Kept in data/ so the bot is warm again right after a restart
+cnx = sqlite3.connect("data/ticker_cache.db")
+cnx.execute("""CREATE TABLE IF NOT EXISTS classifications (
+        ticker TEXT PRIMARY KEY,
+        asset TEXT,
+        provider_id TEXT,
+        website TEXT,
+        updated REAL
+    )""")
+cnx.execute("""CREATE TABLE IF NOT EXISTS tv_symbols (
+        symbol TEXT,
+        asset TEXT,
+        exchange TEXT,
+        market TEXT,
+        tv_symbol TEXT,
+        updated REAL,
+        PRIMARY KEY (symbol, asset)
+    )""")
+cnx.commit()
+
+# New classifications are kept here and written in one go by flush_classifications()
+# ticker -> (asset, provider_id, website, updated)
+pending_classifications = {}
+
+
+def get_classification(ticker: str) -> Optional[tuple[str, str, str]]:
+    """
+    Gets the saved classification of the ticker, if it is not older than the TTL.
+
+    Parameters
+    ----------
+    ticker : str
+        The ticker of the coin or stock.
+
+    Returns
+    -------
+    Optional[tuple[str, str, str]]
+        str
+            The asset class, either "crypto" or "stock".
+        str
+            The id of the provider, the CoinGecko id for coins, can be None.
+        str
+            The website of the coin or stock.
+    """
+
+    if ticker in pending_classifications:
+        return pending_classifications[ticker][:3]
+
+    return cnx.execute(
+        "SELECT asset, provider_id, website FROM classifications WHERE ticker = ? AND updated > ?",
+        (ticker, time.time() - ttl),
+    ).fetchone()
+
+
+def set_classification(
+    ticker: str, asset: str, provider_id: Optional[str], website: str
+) -> None:
+    """
+    Saves the classification of the ticker, it is written to the database by flush_classifications().
+
+    Parameters
+    ----------
+    ticker : str
+        The ticker of the coin or stock.
+    asset : str
+        The asset class, either "crypto" or "stock".
+    provider_id : Optional[str]
+        The id of the provider, the CoinGecko id for coins.
+    website : str
+        The website of the coin or stock.
+
+    Returns
+    -------
+    None
+    """
+
+    pending_classifications[ticker] = (asset, provider_id, website, time.time())
+
+
+def flush_classifications() -> None:
+    """
+    Writes the new classifications to the database, with a single commit.
+
+    Returns
+    -------
+    None
+    """
+
+    global pending_classifications
+
+    if not pending_classifications:
+        return
+
+    rows, pending_classifications = pending_classifications, {}
+
+    cnx.executemany(
+        "REPLACE INTO classifications VALUES (?, ?, ?, ?, ?)",
+        [(ticker, *row) for ticker, row in rows.items()],
+    )
+    cnx.commit()
+
+
+@loop(minutes=5)
+async def flush_ticker_cache() -> None:
+    """
+    Writes the new classifications to the database every 5 minutes, started in on_ready().
+
+    Returns
+    -------
+    None
+    """
+
+    flush_classifications()
+
+
+def get_tv_symbol(symbol: str, asset: str) -> Optional[tuple[str, str, str]]:
+    """
+    Gets the saved TradingView exchange, market and symbol, if it is not older than the TTL.
+
+    Parameters
+    ----------
+    symbol : str
+        The ticker of the stock / crypto.
+    asset : str
+        The type of asset, either "stock" or "crypto".
+
+    Returns
+    -------
+    Optional[tuple[str, str, str]]
+        The exchange, market and TradingView symbol, same as TV_data.get_symbol_data().
+    """
+
+    return cnx.execute(
+        "SELECT exchange, market, tv_symbol FROM tv_symbols WHERE symbol = ? AND asset = ? AND updated > ?",
+        (symbol, asset, time.time() - ttl),
+    ).fetchone()
+
+
+def set_tv_symbol(
+    symbol: str, asset: str, exchange: str, market: str, tv_symbol: str
+) -> None:
+    """
+    Saves the TradingView exchange, market and symbol.
+
+    Parameters
+    ----------
+    symbol : str
+        The ticker of the stock / crypto.
+    asset : str
+        The type of asset, either "stock" or "crypto".
+    exchange : str
+        The exchange the symbol is traded on.
+    market : str
+        The market the symbol is traded on.
+    tv_symbol : str
+        The symbol as it is known by TradingView, for instance with USD added.
+
+    Returns
+    -------
+    None
+    """
+
+    cnx.execute(
+        "REPLACE INTO tv_symbols VALUES (?, ?, ?, ?, ?, ?)",
+        (symbol, asset, exchange, market, tv_symbol, time.time()),
+    )
+    cnx.commit()
+
+
+def set_tv_symbols(rows: List[tuple[str, str, str, str, str]]) -> None:
+    """
+    Saves many TradingView exchanges, markets and symbols at once, with a single commit.
+
+    Parameters
+    ----------
+    rows : List[tuple[str, str, str, str, str]]
+        The symbol, asset, exchange, market and TradingView symbol, same as the arguments of set_tv_symbol().
+
+    Returns
+    -------
+    None
+    """
+
+    now = time.time()
+    cnx.executemany(
+        "REPLACE INTO tv_symbols VALUES (?, ?, ?, ?, ?, ?)",
+        [(*row, now) for row in rows],
+    )
+    cnx.commit()
@@ -1,18 +1,73 @@
 ## > Imports
 # > Standard libaries
 from __future__ import annotations
-import re
-import json
-import random
-import string
-import requests
+import asyncio
+import datetime
+import time
 import traceback
 from typing import Optional, List
 
 # > 3rd party dependencies
-import aiohttp
 import pandas as pd
-from tradingview_ta import TA_Handler, Interval
+from discord.ext.tasks import loop
+from tradingview_ta import get_multiple_analysis, Interval
+
+# > Local dependencies
+from util.tv_socket import tv_quotes
+from util.ticker_cache import get_tv_symbol, set_tv_symbols
+from util.circuit_breaker import breakers
+from util.quotes import quotes
+from util.vars import config, post_json_data, stream_json_data
+from util.cache import TTLCache
+
+# How often in seconds the symbols that are listed on TradingView are downloaded again
+universe_refresh = (config.get("TRADINGVIEW", {}) or {}).get(
+    "UNIVERSE_REFRESH", 6 * 60 * 60
+)
+
+# The 4h candles of US stocks follow the trading session, they start at 09:30 and 13:30 ET and the last one ends at 16:00 ET
+session_boundaries = [
+    datetime.time(hour=9, minute=30),
+    datetime.time(hour=13, minute=30),
+    datetime.time(hour=16),
+]
+
+
+def candle_age(screener: str) -> float:
+    """
+    Returns how many seconds ago the current 4h candle of this screener started, or the last one closed.
+
+    Parameters
+    ----------
+    screener : str
+        The TradingView screener, for instance "america" or "crypto".
+
+    Returns
+    -------
+    float
+        The number of seconds since the last candle boundary.
+    """
+
+    # Crypto trades all day, its 4h candles start every 4 hours from midnight UTC
+    if screener != "america":
+        return time.time() % (4 * 60 * 60)
+
+    now = pd.Timestamp.now(tz="America/New_York")
+
+    # Go back to the last boundary on a weekday, holidays only make the cache expire once more
+    for days in range(8):
+        date = now.date() - datetime.timedelta(days=days)
+        if date.weekday() > 4:
+            continue
+
+        for boundary in reversed(session_boundaries):
+            start = pd.Timestamp(datetime.datetime.combine(date, boundary)).tz_localize(
+                "America/New_York"
+            )
+            if start <= now:
+                return (now - start).total_seconds()
+
+    return 0
 
 
 class TV_data:
@@ -20,28 +75,35 @@ class TV_data:
     This class is used to get the current price, 24h change, and volume of a stock.
     It also includes methods to get the TradingView TA data.
 
+    The symbols that are listed on TradingView are downloaded in the background by update_universe().
+    Use the shared instance tv instead of making a new one.
+
     Methods
     -------
-    on_msg(ws: aiohttp.ClientWebSocketResponse, msg) -> Optional[tuple[float, float, float]]:
-        Parses the message from the TradingView API.
-    sendMessage(ws: aiohttp.ClientWebSocketResponse, func: str, args: List[str]) -> None:
-        Sends a message to the TradingView API.
+    get_scanner_symbols(market: str) -> List[dict]:
+        Gets all symbols of a market from the TradingView scanner.
+    update_universe() -> None:
+        Downloads the symbols that are listed on TradingView and replaces the old lists at once.
     get_symbol_data(symbol: str, asset: str) -> Optional[tuple[str, str]]:
         Helper function to get the symbol data from the TradingView API.
+    find_symbol_data(symbol: str, asset: str) -> Optional[tuple[str, str, str]]:
+        Searches the TradingView symbol lists for the exchange and market this symbol is traded on.
+    get_tv_data(symbol: str, asset: str, max_age: float = None) -> Optional[tuple[float, float, float, str]]:
+        Gets the current price, volume and 24h change, shared with the other cogs.
+    get_tv_quotes(symbols: List[str], asset: str, max_age: float = None) -> dict:
+        Gets the current price, 24h change and volume of many symbols in one request to the TradingView scanner.
+    fetch_tv_data(symbol: str, asset: str) -> Optional[tuple[float, float, float, str]]:
+        Reads the current price, volume and 24h change from the shared TradingView websocket.
 
     get_tv_TA(symbol: str, asset: str) -> Optional[str]:
         Gets the current TA (technical analysis) data from the TradingView API.
+    get_tv_TA_batch() -> None:
+        Gets the TA of all waiting requests, using one request per screener.
+    analyse_pending(pending: dict) -> None:
+        Requests the TA of the waiting requests and gives each of them its result.
     """
 
     def __init__(self) -> None:
-        # Get the current symbols and exchanges on TradingView
-        tv_stocks = requests.get("https://scanner.tradingview.com/america/scan").json()[
-            "data"
-        ]
-        tv_crypto = requests.get("https://scanner.tradingview.com/crypto/scan").json()[
-            "data"
-        ]
-
         self.stock_indices = [
             "AMEX:SPY",
             "NASDAQ:NDX",
@@ -57,16 +119,8 @@ class TV_data:
             sym.split(":")[1] for sym in self.stock_indices
         ]
 
-        tv_stocks = pd.DataFrame(tv_stocks).drop(columns=["d"])
-        self.tv_stocks = pd.concat(
-            [tv_stocks, pd.DataFrame(self.stock_indices, columns=["s"])]
-        )
-        self.tv_stocks[["exchange", "stock"]] = self.tv_stocks["s"].str.split(
-            ":", 1, expand=True
-        )
-
         # Get all EXCHANGE:INDEX symbols
-        crypto_indices = [
+        self.crypto_indices = [
             "CRYPTOCAP:TOTAL",
             "CRYPTOCAP:BTC.D",
             "CRYPTOCAP:OTHERS.D",
@@ -74,85 +128,136 @@ class TV_data:
             "CRYPTOCAP:USDT.D",
         ]
 
-        tv_crypto = pd.DataFrame(tv_crypto).drop(columns=["d"])
-        self.tv_crypto = pd.concat(
-            [tv_crypto, pd.DataFrame(crypto_indices, columns=["s"])]
-        )
-        self.tv_crypto[["exchange", "stock"]] = self.tv_crypto["s"].str.split(
-            ":", 1, expand=True
+        # Only the indices are known until update_universe() has downloaded the symbols
+        # Until then the symbols that were found before a restart are read from the ticker cache
+        self.loaded = {"stock": False, "crypto": False}
+
+        # The (symbol, asset) pairs that were found since the last update, saved in the ticker cache by update_universe()
+        self.resolved = set()
+
+        self.tv_stocks = self.symbols_index([], self.stock_indices, "america")
+        self.tv_crypto = self.symbols_index(
+            [], self.crypto_indices, "crypto", ["USD", "USDT"]
         )
 
-    async def on_msg(
-        self, ws: aiohttp.ClientWebSocketResponse, msg
-    ) -> Optional[tuple[float, float, float]]:
+        # The formatted TA per (screener, "EXCHANGE:SYMBOL"), valid until the current 4h candle closes
+        self.ta_cache = TTLCache(max_entries=1024)
+
+        # TA requests waiting for the next batch, (screener, "EXCHANGE:SYMBOL") -> futures
+        self.ta_pending = {}
+
+    async def get_scanner_symbols(self, market: str) -> Optional[List[dict]]:
         """
-        Parses the message from the TradingView API.
+        Gets all symbols of a market from the TradingView scanner.
+        The response is parsed while it is downloaded and only the symbol names are kept.
+
+        Parameters
+        ----------
+        market : str
+            The market to scan, for instance "america" or "crypto".
 
         Returns
         -------
-        Optional[tuple[float, float, float, str]]
-            float
-                The current price.
-            float
-                The current 24h change.
-            float
-                The current volume.
+        Optional[List[dict]]
+            The symbols as {"s": "EXCHANGE:SYMBOL"}, None if they did not change since the last download or the download failed.
         """
 
-        try:
-            # Try again
-            if '"m":' not in msg:
-                return None
-            elif Res := re.findall("^.*?({.*)$", msg):
-                jsonRes = json.loads(Res[0].split("~m~")[0])
-                if "m" in jsonRes.keys():
-                    if jsonRes["m"] == "qsd":
-                        try:
-                            price = float(jsonRes["p"][1]["v"]["lp"])
-                            change = float(jsonRes["p"][1]["v"]["ch"])
-                            volume = float(jsonRes["p"][1]["v"]["volume"])
-                        except KeyError:
-                            print("KeyError in TradingView ws_data")
-                            return None
-
-                        if price != 0:
-                            perc_change = round((change / price) * 100, 2)
-                        else:
-                            print("TradingView returns price=0")
-                            return None
-
-                        return price, perc_change, volume
-            else:
-                # ping packet
-                pingStr = re.findall(".......(.*)", msg)
-                if len(pingStr) != 0:
-                    pingStr = pingStr[0]
-                    ws.send_str("~m~" + str(len(pingStr)) + "~m~" + pingStr)
-
-                return None
-        except Exception:
-            print(traceback.format_exc())
+        return await stream_json_data(
+            f"https://scanner.tradingview.com/{market}/scan",
+            key="data",
+            fields=["s"],
+            if_changed=True,
+        )
 
-    async def sendMessage(
-        self, ws: aiohttp.ClientWebSocketResponse, func: str, args: List[str]
-    ) -> None:
+    def symbols_index(
+        self,
+        symbols: List[dict],
+        indices: List[str],
+        market: str,
+        suffixes: List[str] = None,
+    ) -> dict:
         """
-        Sends a message to the TradingView API.
-        This needs to be done before any data can be retrieved.
+        Makes the lookup table of the symbols and indices, so a ticker is found with one lookup.
+        The ticker itself is preferred, then the ticker with the first suffix and so on.
+        Of symbols with the same name on multiple exchanges the first one in the scanner list is used.
 
         Parameters
         ----------
-        ws : aiohttp.ClientWebSocketResponse
-            The websocket object to send the message from.
-        func : str
-            The function to call, all start with "quote_" followed by the function name.
-        args : List[str]
-            The list of arguments to send in the message.
+        symbols : List[dict]
+            The symbols as {"s": "EXCHANGE:SYMBOL"}.
+        indices : List[str]
+            The indices as "EXCHANGE:INDEX".
+        market : str
+            The market of these symbols, for instance "america" or "crypto".
+        suffixes : List[str], optional
+            The quote currencies that may be added to a ticker, for instance ["USD", "USDT"], by default None.
+
+        Returns
+        -------
+        dict
+            Maps the ticker to the same tuple as get_symbol_data().
+        """
+
+        pairs = [
+            tv_symbol.split(":", 1)
+            for tv_symbol in [symbol["s"] for symbol in symbols] + indices
+        ]
+
+        index = {}
+
+        for exchange, symbol in pairs:
+            index.setdefault(symbol, (exchange, market, symbol))
+
+        # Then the tickers that are only found with a suffix, such as BTC for BTCUSD
+        for suffix in suffixes or []:
+            for exchange, symbol in pairs:
+                if symbol.endswith(suffix) and len(symbol) > len(suffix):
+                    index.setdefault(symbol[: -len(suffix)], (exchange, market, symbol))
+
+        return index
+
+    async def update_universe(self) -> None:
         """
+        Downloads the symbols that are listed on TradingView and replaces the old lists at once.
+        A market that did not change, or could not be downloaded, keeps its old list.
 
-        as_json = json.dumps({"m": func, "p": args}, separators=(",", ":"))
-        prepended = "~m~" + str(len(as_json)) + "~m~" + as_json
-        await ws.send_str(prepended)
+        Returns
+        -------
+        None
+        """
+
+        # Save the symbols that were used, in one go instead of on every lookup
+        if self.resolved:
+            set_tv_symbols(
+                [
+                    (symbol, asset, *self.find_symbol_data(symbol, asset))
+                    for symbol, asset in self.resolved
+                ]
+            )
+            self.resolved = set()
+
+        tv_stocks, tv_crypto = await asyncio.gather(
+            self.get_scanner_symbols("america"), self.get_scanner_symbols("crypto")
+        )
+
+        # Build the new tables first, so lookups never see a half updated table
+        stocks = self.tv_stocks
+        crypto = self.tv_crypto
+
+        if tv_stocks:
+            stocks = self.symbols_index(tv_stocks, self.stock_indices, "america")
+        if tv_crypto:
+            crypto = self.symbols_index(
+                tv_crypto, self.crypto_indices, "crypto", ["USD", "USDT"]
+            )
+
+        self.tv_stocks, self.tv_crypto = stocks, crypto
+        self.loaded["stock"] = self.loaded["stock"] or bool(tv_stocks)
+        self.loaded["crypto"] = self.loaded["crypto"] or bool(tv_crypto)
+
+        print(
+            f"Updated TradingView symbols, {len(stocks)} stock and {len(crypto)} crypto tickers"
+        )
 
     def get_symbol_data(
         self, symbol: str, asset: str
@@ -160,6 +265,38 @@ class TV_data:
         """
         Helper function to get the symbol data from the TradingView API.
         This data included the exchange and market this symbol is traded on.
+        This is one dictionary lookup, the ticker cache is only used until update_universe() has downloaded the symbols.
+
+        Parameters
+        ----------
+        symbol : str
+            The ticker of the stock / crypto.
+        asset : str
+            The type of asset, either "stock" or "crypto".
+
+        Returns
+        -------
+        Optional[tuple[str, str, str]]
+            str
+                The exchange the symbol is traded on.
+            str
+                The market the symbol is traded on.
+            str
+                The symbol itself.
+        """
+
+        if symbol_data := self.find_symbol_data(symbol, asset):
+            self.resolved.add((symbol, asset))
+            return symbol_data
+
+        if not self.loaded["stock" if asset == "stock" else "crypto"]:
+            return get_tv_symbol(symbol, asset)
+
+    def find_symbol_data(
+        self, symbol: str, asset: str
+    ) -> Optional[tuple[str, str, str]]:
+        """
+        Searches the TradingView symbol lists for the exchange and market this symbol is traded on.
 
         Parameters
         ----------
@@ -179,43 +316,124 @@ class TV_data:
                 The symbol itself.
         """
 
+        # Crypto tickers without USD or USDT are also in the table
         if asset == "stock":
-            stock = self.tv_stocks.loc[self.tv_stocks["stock"] == symbol]
-            if not stock.empty:
-                return stock["exchange"].values[0], "america", symbol
-        else:
-            crypto = self.tv_crypto.loc[self.tv_crypto["stock"] == symbol]
-            if not crypto.empty:
-                return crypto["exchange"].values[0], "crypto", symbol
-            else:
-                if not symbol.endswith("USD") or not symbol.endswith("USDT"):
-
-                    # If it crypto try adding USD or USDT
-                    crypto_USD = self.tv_crypto.loc[
-                        self.tv_crypto["stock"] == symbol + "USD"
-                    ]
-                    crypto_USDT = self.tv_crypto.loc[
-                        self.tv_crypto["stock"] == symbol + "USDT"
-                    ]
-
-                    if not crypto_USD.empty:
-                        return (
-                            crypto_USD["exchange"].values[0],
-                            "crypto",
-                            crypto_USD["stock"].values[0],
-                        )
-                    elif not crypto_USDT.empty:
-                        return (
-                            crypto_USDT["exchange"].values[0],
-                            "crypto",
-                            crypto_USDT["stock"].values[0],
-                        )
+            return self.tv_stocks.get(symbol)
+        return self.tv_crypto.get(symbol)
 
     async def get_tv_data(
+        self, symbol: str, asset: str, max_age: float = None
+    ) -> Optional[tuple[float, float, float]]:
+        """
+        Gets the current price, volume and 24h change from the TradingView API.
+        The quote is shared with the other cogs, it is only requested if it is older than max_age seconds.
+
+        Parameters
+        ----------
+        symbol: string
+            The ticker of the stock / crypto, e.g. "AAPL" or "BTCUSDT".
+        asset: string
+            The type of asset, either "stock" or "crypto".
+        max_age : float, optional
+            The maximum age of the quote in seconds, by default the QUOTES.MAX_AGE setting.
+
+        Returns
+        -------
+        Optional[tuple[float, float, float, str]]
+            The same as fetch_tv_data().
+        """
+
+        return await quotes.get(
+            "tradingview",
+            (symbol, asset),
+            lambda: self.fetch_tv_data(symbol, asset),
+            max_age,
+        )
+
+    async def get_tv_quotes(
+        self, symbols: List[str], asset: str, max_age: float = None
+    ) -> dict:
+        """
+        Gets the current price, 24h change and volume of many symbols in one request to the TradingView scanner.
+        The quotes are shared with get_tv_data(), symbols that the scanner does not know are requested using get_tv_data().
+
+        Parameters
+        ----------
+        symbols : List[str]
+            The tickers of the stocks / cryptos.
+        asset : str
+            The type of asset, either "stock" or "crypto".
+        max_age : float, optional
+            The maximum age of the quotes in seconds, by default the QUOTES.MAX_AGE setting.
+
+        Returns
+        -------
+        dict
+            Maps the symbol to the same tuple as get_tv_data(), symbols without a quote are left out.
+        """
+
+        results = {}
+
+        # "EXCHANGE:SYMBOL" -> symbol, for the symbols that are not known yet
+        missing = {}
+        market = "america" if asset == "stock" else "crypto"
+
+        for symbol in symbols:
+            if (
+                quote := quotes.peek("tradingview", (symbol, asset), max_age)
+            ) is not None:
+                results[symbol] = quote
+            elif symbol_data := self.get_symbol_data(symbol, asset):
+                missing[f"{symbol_data[0]}:{symbol_data[2]}"] = symbol
+
+        if missing and breakers["tradingview"].available():
+            try:
+                response = await post_json_data(
+                    f"https://scanner.tradingview.com/{market}/scan",
+                    json={
+                        "symbols": {"tickers": list(missing), "query": {"types": []}},
+                        "columns": ["close", "change", "volume"],
+                    },
+                )
+
+                for row in response.get("data", []):
+                    symbol = missing.pop(row["s"], None)
+                    price, change, volume = row["d"]
+
+                    if symbol is None or not price:
+                        continue
+
+                    quote = (
+                        price,
+                        round(change or 0, 2),
+                        volume or 0,
+                        row["s"].split(":")[0],
+                    )
+                    quotes.put("tradingview", (symbol, asset), quote)
+                    results[symbol] = quote
+            except Exception as e:
+                # The symbols that are still missing are requested using the websocket
+                print("TradingView scanner error. Error:", e)
+                breakers["tradingview"].record(False)
+
+        # Indices and other symbols that are not in the scanner use the websocket, all at once
+        symbols = list(missing.values())
+        socket_quotes = await asyncio.gather(
+            *[self.get_tv_data(symbol, asset, max_age) for symbol in symbols],
+            return_exceptions=True,
+        )
+
+        for symbol, quote in zip(symbols, socket_quotes):
+            if quote and not isinstance(quote, Exception):
+                results[symbol] = quote
+
+        return results
+
+    async def fetch_tv_data(
         self, symbol: str, asset: str
     ) -> Optional[tuple[float, float, float]]:
         """
-        Gets the current price, volume, 24h change, and TA data from the TradingView API.
+        Requests the current price, volume, 24h change, and TA data from the TradingView API.
 
         Parameters
         ----------
@@ -237,64 +455,29 @@ class TV_data:
                 The exchange that this symbol is listed on.
         """
 
-        try:
-            symbol_data = self.get_symbol_data(symbol, asset)
-            if symbol_data is not None:
-                # Format it "exchange:symbol"
-                exchange = symbol_data[0]
-                symbol = f"{exchange}:{symbol_data[2]}"
-            else:
-                return False
-
-            # Create a session
-            session = aiohttp.ClientSession()
-            async with session.ws_connect(
-                url="wss://data.tradingview.com/socket.io/websocket",
-                headers={"Origin": "https://data.tradingview.com"},
-            ) as ws:
-
-                # This is mandatory to get the data
-                auth_str = "qs_" + "".join(
-                    random.choice(string.ascii_lowercase) for i in range(12)
-                )
-
-                # Send messages via websocket
-                await self.sendMessage(ws, "quote_create_session", [auth_str])
-                await self.sendMessage(
-                    ws, "quote_set_fields", [auth_str, "ch", "lp", "volume"]
-                )
-                await self.sendMessage(ws, "quote_add_symbols", [auth_str, symbol])
-
-                counter = 0
-
-                # Check for response
-                async for msg in ws:
-                    counter += 1
-
-                    if msg.type == aiohttp.WSMsgType.TEXT:
-                        resp = await self.on_msg(ws, msg.data)
-
-                        if resp is not None:
-                            await ws.close()
-                            await session.close()
-                            return resp[0], resp[1], resp[2], exchange
+        symbol_data = self.get_symbol_data(symbol, asset)
+        if symbol_data is not None:
+            # Format it "exchange:symbol"
+            exchange = symbol_data[0]
+            symbol = f"{exchange}:{symbol_data[2]}"
+        else:
+            return False
 
-                        elif counter == 3:
-                            await session.close()
-                            return False
+        # Skip TradingView while it is down
+        if not breakers["tradingview"].available():
+            return False
 
-                    elif msg.type == aiohttp.WSMsgType.ERROR:
-                        # self.restart_sockets()
-                        print("Error")
-                        await session.close()
-                        return False
+        # The quote is read from the shared TradingView socket
+        if quote := await tv_quotes.get_quote(symbol):
+            return *quote, exchange
 
-        except Exception:
-            print(traceback.format_exc())
+        return False
 
-    def get_tv_TA(self, symbol: str, asset: str) -> Optional[str]:
+    async def get_tv_TA(self, symbol: str, asset: str) -> Optional[str]:
         """
         Gets the current TA (technical analysis) data from the TradingView API.
+        Requests made at the same time are combined into one request per screener,
+        and the result is reused until the current 4h candle of the screener closes.
 
         Parameters
         ----------
@@ -315,29 +498,112 @@ class TV_data:
 
         symbol_data = self.get_symbol_data(symbol, asset)
 
-        # Get the TradingView TA for symbol
-        # Interval can be 1m, 5m, 15m, 30m, 1h, 2h, 4h, 1d, 1W, 1M
+        if symbol_data is None:
+            return
+
+        exchange, market, symbol = symbol_data
+        key = (market, f"{exchange}:{symbol}".upper())
+
+        # Only use results from the current candle
+        if (analysis := self.ta_cache.get(key, candle_age(market))) is not None:
+            return analysis
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        # The first request starts the batch, the others that arrive in the meantime join it
+        if not self.ta_pending:
+            loop.call_later(0.05, lambda: asyncio.ensure_future(self.get_tv_TA_batch()))
+        self.ta_pending.setdefault(key, []).append(future)
+
+        return await future
+
+    async def get_tv_TA_batch(self) -> None:
+        """
+        Gets the TA of all waiting requests, using one request per screener.
+
+        Returns
+        -------
+        None
+        """
+
+        pending, self.ta_pending = self.ta_pending, {}
+
         try:
-            if symbol_data is not None:
-                exchange, market, symbol = symbol_data
+            await self.analyse_pending(pending)
+        except Exception:
+            print(traceback.format_exc())
+        finally:
+            # Never leave a request waiting, also not after an unexpected error
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_result(None)
+
+    async def analyse_pending(self, pending: dict) -> None:
+        """
+        Requests the TA of the waiting requests and gives each of them its result.
+
+        Parameters
+        ----------
+        pending : dict
+            The waiting requests, (screener, "EXCHANGE:SYMBOL") -> futures.
 
-                # Wait max 5 sec
-                analysis = (
-                    TA_Handler(
-                        symbol=symbol,
+        Returns
+        -------
+        None
+        """
+
+        screeners = {}
+        for market, symbol in pending:
+            screeners.setdefault(market, []).append(symbol)
+
+        for market, symbols in screeners.items():
+            # Get the TradingView TA for the symbols, this is blocking so run it in a thread
+            # Interval can be 1m, 5m, 15m, 30m, 1h, 2h, 4h, 1d, 1W, 1M
+            try:
+                analyses = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    lambda: get_multiple_analysis(
                         screener=market,
-                        exchange=exchange,
                         interval=Interval.INTERVAL_4_HOURS,
+                        symbols=symbols,
+                        # Wait max 5 sec
                         timeout=5,
-                    )
-                    .get_analysis()
-                    .summary
+                    ),
                 )
+            except Exception as e:
+                print(f"TradingView TA error for {symbols}.", e)
+                analyses = {}
 
-                # Format the analysis
-                formatted_analysis = f"{analysis['RECOMMENDATION']}\n{analysis['BUY']}📈 {analysis['NEUTRAL']}⌛️ {analysis['SELL']}📉"
+            for symbol in symbols:
+                formatted_analysis = None
 
-                return formatted_analysis
+                if (analysis := analyses.get(symbol)) is not None:
+                    summary = analysis.summary
+
+                    # Format the analysis
+                    formatted_analysis = f"{summary['RECOMMENDATION']}\n{summary['BUY']}📈 {summary['NEUTRAL']}⌛️ {summary['SELL']}📉"
+                    self.ta_cache.set((market, symbol), formatted_analysis)
+
+                for future in pending[(market, symbol)]:
+                    if not future.done():
+                        future.set_result(formatted_analysis)
+
+
+# The instance that is shared by all cogs
+tv = TV_data()
+
+
+@loop(seconds=universe_refresh)
+async def update_tv_universe() -> None:
+    """
+    Downloads the symbols that are listed on TradingView every universe_refresh seconds.
+    Started in on_ready(), since it needs the event loop.
+
+    Returns
+    -------
+    None
+    """
 
-        except Exception as e:
-            print(f"TradingView TA error for {symbol}.", e)
+    await tv.update_universe()
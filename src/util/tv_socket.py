@@ -0,0 +1,327 @@
+## > Imports
+# > Standard libaries
+from __future__ import annotations
+import asyncio
+import random
+import re
+import string
+import time
+import traceback
+from typing import List, Optional
+
+# > 3rd party dependencies
+import aiohttp
+
+# Local dependencies
+from util.vars import ws_connect
+from util.json_codec import loads, dumps
+from util.circuit_breaker import breakers
+
+# Every packet on the TradingView socket starts with ~m~<length>~m~
+FRAME = re.compile(r"~m~(\d+)~m~")
+
+# The quote fields that are needed for a complete quote
+fields = ["lp", "ch", "volume"]
+
+# TradingView sends a heartbeat every few seconds, a connection that is silent for longer is seen as lost
+receive_timeout = 60
+
+
+class TVQuoteSocket:
+    """
+    One long-lived connection to the TradingView quote websocket, shared by all lookups.
+    Symbols are added to the quote session when they are first requested and removed after idle_time seconds without requests.
+    The latest quote of each symbol is kept up to date from the qsd packets.
+    The quotes are dropped when the connection is lost, so an outage never returns old prices as current.
+
+    Methods
+    -------
+    get_quote(symbol: str, timeout: float = 5) -> Optional[tuple[float, float, float]]:
+        Returns the latest price, 24h change and volume of the symbol.
+    close() -> None:
+        Stops the connection.
+    """
+
+    def __init__(self, idle_time: float = 60 * 60) -> None:
+        self.idle_time = idle_time
+
+        self.ws = None
+        self.task = None
+        self.session_id = None
+
+        # "EXCHANGE:SYMBOL" -> latest values of the quote fields, and its status
+        self.table = {}
+        # "EXCHANGE:SYMBOL" -> last time the quote was requested
+        self.last_used = {}
+        # "EXCHANGE:SYMBOL" -> futures waiting for the first complete quote
+        self.waiters = {}
+
+    def start(self) -> None:
+        """
+        Starts the connection if it is not running yet.
+
+        Returns
+        -------
+        None
+        """
+
+        if self.task is None or self.task.done():
+            self.task = asyncio.ensure_future(self.run())
+
+    async def close(self) -> None:
+        """
+        Stops the connection.
+
+        Returns
+        -------
+        None
+        """
+
+        if self.task is not None:
+            self.task.cancel()
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def send(self, func: str, args: List[str]) -> None:
+        """
+        Sends a message to the TradingView API.
+
+        Parameters
+        ----------
+        func : str
+            The function to call, for instance "quote_add_symbols".
+        args : List[str]
+            The list of arguments to send in the message.
+
+        Returns
+        -------
+        None
+        """
+
+        await self.send_packet(dumps({"m": func, "p": args}))
+
+    async def send_packet(self, packet: str) -> None:
+        await self.ws.send_str(f"~m~{len(packet)}~m~{packet}")
+
+    async def run(self) -> None:
+        """
+        Keeps the connection open, reconnecting with a growing delay if it is lost.
+
+        Returns
+        -------
+        None
+        """
+
+        breaker = breakers["tradingview"]
+        delay = 1
+
+        while True:
+            try:
+                async with ws_connect(
+                    url="wss://data.tradingview.com/socket.io/websocket",
+                    headers={"Origin": "https://data.tradingview.com"},
+                    receive_timeout=receive_timeout,
+                ) as ws:
+                    self.ws = ws
+
+                    # A new quote session with all symbols that are in use
+                    self.session_id = "qs_" + "".join(
+                        random.choice(string.ascii_lowercase) for i in range(12)
+                    )
+                    await self.send("quote_create_session", [self.session_id])
+                    await self.send("quote_set_fields", [self.session_id, *fields])
+                    if self.last_used:
+                        await self.send(
+                            "quote_add_symbols", [self.session_id, *self.last_used]
+                        )
+
+                    breaker.record(True)
+                    delay = 1
+
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            await self.on_msg(msg.data)
+                        elif msg.type == aiohttp.WSMsgType.ERROR:
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                print(traceback.format_exc())
+                breaker.record(False)
+
+            # The quotes are not updated anymore, the symbols are added again after reconnecting
+            self.ws = None
+            self.table.clear()
+
+            print(f"TradingView quote socket closed, reconnecting in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(60, delay * 2)
+
+    async def on_msg(self, msg: str) -> None:
+        """
+        Handles all packets in a message from the TradingView websocket.
+
+        Parameters
+        ----------
+        msg : str
+            The message that is received from the TradingView websocket.
+
+        Returns
+        -------
+        None
+        """
+
+        pos = 0
+        while match := FRAME.match(msg, pos):
+            pos = match.end() + int(match.group(1))
+            packet = msg[match.end() : pos]
+
+            # Heartbeats have to be send back, otherwise the connection is closed
+            if packet.startswith("~h~"):
+                await self.send_packet(packet)
+                continue
+
+            try:
+                data = loads(packet)
+            except Exception:
+                continue
+
+            if isinstance(data, dict) and data.get("m") == "qsd":
+                self.on_quote(data["p"][1])
+
+    def on_quote(self, update: dict) -> None:
+        """
+        Merges a quote update into the table and wakes up the requests that waited for it.
+
+        Parameters
+        ----------
+        update : dict
+            The quote update, with the symbol under "n", the status under "s" and the changed fields under "v".
+
+        Returns
+        -------
+        None
+        """
+
+        symbol = update["n"]
+        quote = self.table.setdefault(symbol, {})
+        quote["status"] = update.get("s")
+        quote.update(update.get("v", {}))
+
+        result = self.read(symbol)
+        if result is not None or quote["status"] == "error":
+            for future in self.waiters.pop(symbol, []):
+                if not future.done():
+                    future.set_result(result)
+
+    def read(self, symbol: str) -> Optional[tuple[float, float, float]]:
+        """
+        Returns the quote of the symbol from the table, if it is complete.
+
+        Parameters
+        ----------
+        symbol : str
+            The symbol in the format "EXCHANGE:SYMBOL".
+
+        Returns
+        -------
+        Optional[tuple[float, float, float]]
+            float
+                The current price.
+            float
+                The current 24h change.
+            float
+                The current volume.
+        """
+
+        # Only quotes of the open connection are current
+        if self.ws is None:
+            return None
+
+        quote = self.table.get(symbol)
+
+        if quote is None or quote.get("status") != "ok":
+            return None
+        if any(quote.get(field) is None for field in fields):
+            return None
+
+        price = float(quote["lp"])
+        if price == 0:
+            return None
+
+        perc_change = round((float(quote["ch"]) / price) * 100, 2)
+
+        return price, perc_change, float(quote["volume"])
+
+    async def remove_idle(self) -> None:
+        """
+        Removes the symbols from the quote session that have not been requested for idle_time seconds.
+
+        Returns
+        -------
+        None
+        """
+
+        now = time.monotonic()
+        idle = [
+            symbol
+            for symbol, last_used in self.last_used.items()
+            if now - last_used > self.idle_time
+        ]
+
+        for symbol in idle:
+            del self.last_used[symbol]
+            self.table.pop(symbol, None)
+
+        if idle and self.ws is not None:
+            await self.send("quote_remove_symbols", [self.session_id, *idle])
+
+    async def get_quote(
+        self, symbol: str, timeout: float = 5
+    ) -> Optional[tuple[float, float, float]]:
+        """
+        Returns the latest price, 24h change and volume of the symbol.
+        Symbols that are already in the quote session are read from the table, new ones are added.
+
+        Parameters
+        ----------
+        symbol : str
+            The symbol in the format "EXCHANGE:SYMBOL".
+        timeout : float, optional
+            How long to wait for the first quote of a new symbol in seconds, by default 5.
+
+        Returns
+        -------
+        Optional[tuple[float, float, float]]
+            The current price, 24h change and volume, None if TradingView has no quote for this symbol.
+        """
+
+        self.start()
+
+        new = symbol not in self.last_used
+        self.last_used[symbol] = time.monotonic()
+
+        if (quote := self.read(symbol)) is not None:
+            return quote
+
+        if self.table.get(symbol, {}).get("status") == "error":
+            return None
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault(symbol, []).append(future)
+
+        # Symbols that were added before the connection was made are send once it is open
+        if new and self.ws is not None:
+            await self.remove_idle()
+            await self.send("quote_add_symbols", [self.session_id, symbol])
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if future in self.waiters.get(symbol, []):
+                self.waiters[symbol].remove(future)
+
+
+tv_quotes = TVQuoteSocket()
@@ -2,7 +2,6 @@
 # > Standard libaries
 from __future__ import annotations
 from typing import Optional, List
-import json
 import datetime
 from traceback import format_exc
 
@@ -15,8 +14,10 @@ from discord.ext import commands
 
 # Local dependencies
 from util.sentimentanalyis import classify_sentiment
-from util.ticker import classify_ticker
+from util.ticker import classify_ticker, get_coin_exchanges, stock_candidates
+from util.yf_info import get_yf_quotes
 from util.vars import filter_dict
+from util.json_codec import loads
 from util.disc_util import get_emoji
 
 
@@ -203,7 +204,7 @@ async def format_tweet(
     """
 
     # Convert the string json data to json object
-    as_json = json.loads(raw_data)
+    as_json = loads(raw_data)
 
     # Filter based on users we are following
     # Otherwise shows all tweets (including tweets of people who we are not following)
@@ -302,6 +303,11 @@ async def add_financials(
     # Get the unique values
     symbols = list(set(tickers + hashtags))
 
+    # Get the stock quotes of all symbols in one request, the stock lookups below then reuse them
+    await get_yf_quotes(
+        stock_candidates([filter_dict.get(symbol, symbol) for symbol in symbols])
+    )
+
     for ticker in symbols:
 
         # Filter beforehand
@@ -366,6 +372,9 @@ async def add_financials(
             # Currently only adds emojis for crypto exchanges
             if website:
                 if "coingecko" in website:
+                    # CoinGecko coins get their exchanges only now, since they are only needed here
+                    if exchanges is None and "coingecko.com/en/coins/" in website:
+                        exchanges = await get_coin_exchanges(website.split("/")[-1])
                     if exchanges is not None:
                         if "Binance" in exchanges:
                             title = f"{title} {get_emoji(bot, 'binance')}"
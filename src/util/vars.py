@@ -1,9 +1,26 @@
+# > Standard libraries
+from __future__ import annotations
+import asyncio
+import hashlib
+import os
+import re
+import threading
+import time
+from typing import List, Optional
+
 # > 3rd Party Dependencies
 import yaml
 import aiohttp
 import tweepy
-import pandas as pd
 from pycoingecko import CoinGeckoAPI
+from discord.ext.tasks import loop
+
+# > Local dependencies
+from util.cache import TTLCache
+from util.cassette import Cassette
+from util.rate_limit import RateLimiter
+from util.json_codec import loads, dumps
+from util.json_stream import JSONArrayStream
 
 # Read config.yaml content
 with open("config.yaml", "r", encoding="utf-8") as f:
@@ -34,15 +51,534 @@ filter_dict = {
 # Stable coins
 stables = ["USDT", "USD", "BUSD", "DAI", "USDTPERP"]
 
-# Saves all CoinGecko coins, maybe refresh this daily
+# The list of all CoinGecko coins is saved here, so startup does not depend on CoinGecko
+cg_coins_snapshot = "data/cg_coins.json"
+
+# Refresh the coin list daily
+cg_coins_refresh = 24 * 60 * 60
+
+# The id with the most volume for each symbol that is used by multiple coins
+cg_best_ids_snapshot = "data/cg_best_ids.json"
+
 cg = CoinGeckoAPI()
-cg_coins = pd.DataFrame(cg.get_coins_list())
-cg_coins["symbol"] = cg_coins["symbol"].str.upper()
+
+
+class CoinIndex:
+    """
+    Hash index over the CoinGecko coins list, so lookups by symbol, id or name are a single dict lookup.
+    The index is never modified after it is built, a refresh builds a new one.
+
+    Methods
+    -------
+    ids_by_symbol(symbol: str) -> List[str]:
+        Returns the ids of the coins with this symbol.
+    ids_by_name(name: str) -> List[str]:
+        Returns the ids of the coins with this name, ignoring case.
+    get(id: str) -> Optional[dict]:
+        Returns the symbol and name of the coin with this id.
+    """
+
+    def __init__(self, coins: list) -> None:
+        # Uppercase symbol -> ids
+        self.symbols = {}
+        # id -> (uppercase symbol, name)
+        self.coins = {}
+        # Lowercase name -> ids
+        self.names = {}
+
+        for coin in coins:
+            id = coin["id"]
+            symbol = coin["symbol"].upper()
+            name = coin["name"]
+
+            self.coins[id] = (symbol, name)
+            self.symbols.setdefault(symbol, []).append(id)
+            self.names.setdefault(name.lower(), []).append(id)
+
+    def __len__(self) -> int:
+        return len(self.coins)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self.coins
+
+    def ids_by_symbol(self, symbol: str) -> List[str]:
+        """
+        Returns the ids of the coins with this symbol.
+
+        Parameters
+        ----------
+        symbol : str
+            The symbol of the coin, for instance "BTC".
+
+        Returns
+        -------
+        List[str]
+            The CoinGecko ids, empty if the symbol is unknown.
+        """
+
+        return self.symbols.get(symbol.upper(), [])
+
+    def ids_by_name(self, name: str) -> List[str]:
+        """
+        Returns the ids of the coins with this name, ignoring case.
+
+        Parameters
+        ----------
+        name : str
+            The name of the coin, for instance "Bitcoin".
+
+        Returns
+        -------
+        List[str]
+            The CoinGecko ids, empty if the name is unknown.
+        """
+
+        return self.names.get(name.lower(), [])
+
+    def get(self, id: str) -> Optional[dict]:
+        """
+        Returns the symbol and name of the coin with this id.
+
+        Parameters
+        ----------
+        id : str
+            The CoinGecko id of the coin, for instance "bitcoin".
+
+        Returns
+        -------
+        Optional[dict]
+            Dictionary with the keys id, symbol and name, None if the id is unknown.
+        """
+
+        if id not in self.coins:
+            return None
+
+        symbol, name = self.coins[id]
+        return {"id": id, "symbol": symbol, "name": name}
+
+
+def load_cg_coins() -> CoinIndex:
+    """
+    Loads the CoinGecko coins list from the local snapshot.
+
+    Returns
+    -------
+    CoinIndex
+        The coins in the snapshot, empty if there is no snapshot yet.
+    """
+
+    try:
+        with open(cg_coins_snapshot, "r", encoding="utf-8") as f:
+            return CoinIndex(loads(f.read()))
+    except Exception:
+        print(f"No {cg_coins_snapshot} found, waiting for the CoinGecko coins list")
+        return CoinIndex([])
+
+
+def update_cg_coins() -> None:
+    """
+    Downloads the CoinGecko coins list, saves it as snapshot and swaps in a new index for cg_coins.
+    This runs in a background thread and schedules itself again every cg_coins_refresh seconds.
+
+    Returns
+    -------
+    None
+    """
+
+    global cg_coins
+
+    try:
+        coins = cg.get_coins_list()
+
+        # Write to a temporary file first, so the snapshot is never half written
+        with open(cg_coins_snapshot + ".tmp", "w", encoding="utf-8") as f:
+            f.write(dumps(coins))
+        os.replace(cg_coins_snapshot + ".tmp", cg_coins_snapshot)
+
+        # Readers keep using the old index until this assignment
+        cg_coins = CoinIndex(coins)
+        print(f"Updated CoinGecko coins list, {len(cg_coins)} coins")
+    except Exception as e:
+        print("Could not update the CoinGecko coins list. Error:", e)
+
+    timer = threading.Timer(cg_coins_refresh, update_cg_coins)
+    timer.daemon = True
+    timer.start()
+
+
+def get_cg_coins() -> CoinIndex:
+    """
+    Returns the index of the current CoinGecko coins list.
+    Call this once per lookup, since the index can be replaced by update_cg_coins() at any time.
+
+    Returns
+    -------
+    CoinIndex
+        The index of all CoinGecko coins.
+    """
+
+    return cg_coins
+
+
+# Start with the snapshot, then refresh it in the background if it is outdated
+cg_coins = load_cg_coins()
+
+try:
+    snapshot_age = time.time() - os.path.getmtime(cg_coins_snapshot)
+except OSError:
+    snapshot_age = cg_coins_refresh
+
+cg_coins_timer = threading.Timer(
+    max(0, cg_coins_refresh - snapshot_age), update_cg_coins
+)
+cg_coins_timer.daemon = True
+cg_coins_timer.start()
+
+
+def load_cg_best_ids() -> dict:
+    """
+    Loads the best id per ambiguous symbol from the local snapshot.
+
+    Returns
+    -------
+    dict
+        Maps the uppercase symbol to the CoinGecko id, empty if there is no snapshot yet.
+    """
+
+    try:
+        with open(cg_best_ids_snapshot, "r", encoding="utf-8") as f:
+            return loads(f.read())
+    except Exception:
+        return {}
+
+
+async def update_cg_best_ids() -> None:
+    """
+    Finds the id with the most volume for every symbol that is used by multiple coins and saves it as snapshot.
+    The requests use get_json_data(), so they share the CoinGecko rate limit with the rest of the bot.
+
+    Returns
+    -------
+    None
+    """
+
+    global cg_best_ids, cg_best_ids_updated
+
+    cg_coins = get_cg_coins()
+
+    # Try again later if the coins list is not there yet
+    if len(cg_coins) == 0:
+        return
+
+    ambiguous = [ids for ids in cg_coins.symbols.values() if len(ids) > 1]
+    all_ids = [id for ids in ambiguous for id in ids]
+
+    try:
+        volumes = {}
+
+        # Ask for 250 coins per request and leave room for the other CoinGecko requests
+        for i in range(0, len(all_ids), 250):
+            data = await get_json_data(
+                "https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&per_page=250&ids="
+                + ",".join(all_ids[i : i + 250]),
+                max_age=0,
+            )
+
+            # Errors are returned as a dict
+            if not isinstance(data, list):
+                print("Could not update the CoinGecko best ids. Error:", data)
+                return
+
+            for coin in data:
+                volumes[coin["id"]] = coin["total_volume"] or 0
+            await asyncio.sleep(2)
+
+        best_ids = {}
+        for ids in ambiguous:
+            best = max(ids, key=lambda id: volumes.get(id, 0))
+            if volumes.get(best, 0) > 0:
+                best_ids[cg_coins.coins[best][0]] = best
+
+        # Write to a temporary file first, so the snapshot is never half written
+        with open(cg_best_ids_snapshot + ".tmp", "w", encoding="utf-8") as f:
+            f.write(dumps(best_ids))
+        os.replace(cg_best_ids_snapshot + ".tmp", cg_best_ids_snapshot)
+
+        cg_best_ids = best_ids
+        cg_best_ids_updated = time.time()
+        print(f"Updated CoinGecko best ids, {len(cg_best_ids)} ambiguous symbols")
+    except Exception as e:
+        print("Could not update the CoinGecko best ids. Error:", e)
+
+
+@loop(minutes=10)
+async def refresh_cg_best_ids() -> None:
+    """
+    Updates the best ids once the snapshot is older than cg_coins_refresh seconds.
+    A failed update is tried again on the next run, started in on_ready() since it needs the event loop.
+
+    Returns
+    -------
+    None
+    """
+
+    if time.time() - cg_best_ids_updated >= cg_coins_refresh:
+        await update_cg_best_ids()
+
+
+def get_cg_best_id(symbol: str) -> Optional[str]:
+    """
+    Returns the CoinGecko id with the most volume for a symbol that is used by multiple coins.
+
+    Parameters
+    ----------
+    symbol : str
+        The symbol of the coin, for instance "UNI".
+
+    Returns
+    -------
+    Optional[str]
+        The CoinGecko id, None if the symbol is not ambiguous or not known yet.
+    """
+
+    return cg_best_ids.get(symbol.upper())
+
+
+# Same as the coins list, start with the snapshot and refresh it in the background
+cg_best_ids = load_cg_best_ids()
+
+try:
+    cg_best_ids_updated = os.path.getmtime(cg_best_ids_snapshot)
+except OSError:
+    cg_best_ids_updated = 0
+
+# Settings for the shared HTTP client, all of them are optional in config.yaml
+http_config = config.get("HTTP", {}) or {}
+
+# The shared HTTP client, created on first use since it needs a running event loop
+session = None
+
+# GET requests that are currently running, keyed by url, headers and response type
+inflight = {}
+
+# Counters of the HTTP layer, "coalesced" is the number of requests that were
+# answered by an identical request that was already in flight
+# "not_modified" and "unchanged" count polls that were skipped by get_json_data_if_changed()
+http_stats = {"coalesced": 0, "not_modified": 0, "unchanged": 0}
+
+# The ETag, Last-Modified and body hash of the last response per url
+validators = {}
+
+# Default time in seconds that responses of these URLs may be reused
+# Callers of get_json_data() can override this using max_age
+cache_ttls = {
+    r"api\.binance\.com/api/v3/exchangeInfo": 60 * 60,
+    r"api\.coingecko\.com/api/v3/coins/": 5 * 60,
+    r"api\.alternative\.me/fng": 60 * 60,
+    r"finviz\.com/quote\.ashx": 10 * 60,
+}
+
+# Request budget per host, as (requests, per seconds)
+# Binance counts in request weight, see https://binance-docs.github.io/apidocs/spot/en/#limits
+rate_limits = {
+    "api.coingecko.com": (50, 60),
+    "api.binance.com": (1200, 60),
+    "fapi.binance.com": (2400, 60),
+    "api.kucoin.com": (30, 3),
+}
+
+# Shared by all cogs, so bursts are spread out instead of being rejected
+rate_limiter = RateLimiter(rate_limits)
+
+# Only responses of URLs in cache_ttls or requested with a max_age are stored
+response_cache = TTLCache(
+    max_entries=http_config.get("CACHE_ENTRIES", 512),
+    max_size=http_config.get("CACHE_SIZE", 50_000_000),
+)
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Returns the shared aiohttp.ClientSession used for all outbound requests.
+    The session keeps connections alive per host and caches DNS lookups,
+    so repeated requests to the same API skip the TCP and TLS handshakes.
+
+    Returns
+    -------
+    aiohttp.ClientSession
+        The shared session, a new one is created if it was closed.
+    """
+
+    global session
+
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=http_config.get("LIMIT", 100),
+            limit_per_host=http_config.get("LIMIT_PER_HOST", 10),
+            ttl_dns_cache=http_config.get("DNS_CACHE", 300),
+            keepalive_timeout=http_config.get("KEEPALIVE", 30),
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=http_config.get("TIMEOUT", 30),
+            connect=http_config.get("CONNECT_TIMEOUT", 10),
+        )
+        session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    return session
+
+
+# Records or replays all outbound traffic if configured, see util/cassette.py
+cassette_config = http_config.get("CASSETTE", {}) or {}
+cassette = Cassette(
+    mode=cassette_config.get("MODE"),
+    directory=cassette_config.get("DIR", "data/cassettes"),
+    latency=cassette_config.get("LATENCY", 1),
+)
+
+
+def http_request(method: str, url: str, key: str = None, **kwargs):
+    """
+    Starts a request using the shared session, or the cassette if it is recording or replaying.
+    Use it like session.request(), as async context manager.
+
+    Parameters
+    ----------
+    method : str
+        The HTTP method, for instance "GET".
+    url : str
+        The URL of the request.
+    key : str, optional
+        Extra part of the cassette name, by default None.
+    **kwargs
+        Passed to session.request(), for instance headers.
+
+    Returns
+    -------
+    The async context manager that gives the response.
+    """
+
+    return cassette.request(get_session, method, url, key, **kwargs)
+
+
+def ws_connect(url: str, key: str = None, **kwargs):
+    """
+    Opens a websocket using the shared session, or the cassette if it is recording or replaying.
+    Use it like session.ws_connect(), as async context manager.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the websocket.
+    key : str, optional
+        Extra part of the cassette name, for websockets that share a URL, by default None.
+    **kwargs
+        Passed to session.ws_connect(), for instance heartbeat.
+
+    Returns
+    -------
+    The async context manager that gives the websocket.
+    """
+
+    return cassette.ws_connect(get_session, url, key, **kwargs)
+
+
+async def close_session() -> None:
+    """
+    Closes the shared aiohttp.ClientSession, should be called on shutdown.
+
+    Returns
+    -------
+    None
+    """
+
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def get_cache_ttl(url: str) -> float:
+    """
+    Returns how many seconds a cached response of this url may be reused.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the request.
+
+    Returns
+    -------
+    float
+        The time to live in seconds, 0 if the url should not be cached.
+    """
+
+    for pattern, ttl in cache_ttls.items():
+        if re.search(pattern, url):
+            return ttl
+
+    return 0
+
+
+async def request_json_data(
+    url: str,
+    headers: dict = None,
+    text: bool = False,
+    cache_key: tuple = None,
+    weight: int = 1,
+) -> dict | str:
+    """
+    Does the actual GET request for get_json_data(), using the shared session.
+
+    Parameters
+    ----------
+    url : str
+        The URL to get the data from.
+    headers : dict, optional
+        The headers send with the get request, by default None.
+    text : bool, optional
+        If True the response is returned as text instead of JSON, by default False.
+    cache_key : tuple, optional
+        If set, a successful response is stored under this key in the response cache, by default None.
+    weight : int, optional
+        The weight of this request for the rate limiter, by default 1.
+
+    Returns
+    -------
+    dict | str
+        The response as a dict, or as a string if text is True.
+    """
+
+    response = {}
+
+    await rate_limiter.acquire(url, weight)
+
+    async with http_request("GET", url, headers=headers) as r:
+        try:
+            body = await r.read()
+            if text:
+                response = await r.text()
+            else:
+                response = await r.json(loads=loads)
+        except Exception as e:
+            print(f"Error with get request for {url}.", "Error:", e)
+            return response
+
+        if cache_key is not None and r.status == 200:
+            response_cache.set(cache_key, response, len(body))
+
+    return response
+
 
 # Simple function to get website json info
-async def get_json_data(url: str, headers: dict = None, text: bool = False) -> dict:
+async def get_json_data(
+    url: str,
+    headers: dict = None,
+    text: bool = False,
+    max_age: float = None,
+    weight: int = 1,
+) -> dict:
     """
     Asynchronous function to get JSON data from a website.
+    Concurrent calls with the same url and headers share a single request,
+    so the response should be treated as read-only by the caller.
 
     Parameters
     ----------
@@ -50,6 +586,13 @@ async def get_json_data(url: str, headers: dict = None, text: bool = False) -> d
         The URL to get the data from.
     headers : dict, optional
         The headers send with the get request, by default None.
+    text : bool, optional
+        If True the response is returned as text instead of JSON, by default False.
+    max_age : float, optional
+        How old in seconds a cached response may be, 0 disables the cache.
+        By default None, which uses the TTL of the url in cache_ttls.
+    weight : int, optional
+        The weight of this request for the rate limiter, by default 1.
 
     Returns
     -------
@@ -57,25 +600,133 @@ async def get_json_data(url: str, headers: dict = None, text: bool = False) -> d
         The response as a dict.
     """
 
-    async with aiohttp.ClientSession(headers=headers) as session:
-        async with session.get(
-            url,
-        ) as r:
-            try:
-                if text:
-                    response = await r.text()
-                else:
-                    response = await r.json()
-            except Exception as e:
-                print(f"Error with get request for {url}.", "Error:", e)
+    key = (url, tuple(sorted((headers or {}).items())), text)
 
-            # Close the connection
-            await session.close()
+    if max_age is None:
+        max_age = get_cache_ttl(url)
 
-            return response
+    if max_age > 0:
+        cached = response_cache.get(key, max_age)
+        if cached is not None:
+            return cached
 
+    # Wait for the identical request that is already running
+    if key in inflight:
+        http_stats["coalesced"] += 1
+        # Shield it, so a cancelled waiter does not cancel the request for the others
+        return await asyncio.shield(inflight[key])
 
-async def post_json_data(url: str, headers: dict = None) -> dict:
+    task = asyncio.ensure_future(
+        request_json_data(url, headers, text, key if max_age > 0 else None, weight)
+    )
+    inflight[key] = task
+    task.add_done_callback(lambda _: inflight.pop(key, None))
+
+    return await asyncio.shield(task)
+
+
+def conditional_headers(url: str, headers: dict = None) -> dict:
+    """
+    Adds the If-None-Match and If-Modified-Since headers for the last response of this url.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the request.
+    headers : dict, optional
+        The headers of the request, by default None.
+
+    Returns
+    -------
+    dict
+        A copy of the headers, including the conditional headers if they are known.
+    """
+
+    headers = dict(headers or {})
+    etag, last_modified, _ = validators.get(url, (None, None, None))
+
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    return headers
+
+
+def update_validators(url: str, r: aiohttp.ClientResponse, body_hash: str) -> bool:
+    """
+    Saves the ETag, Last-Modified and body hash of the response for the next conditional request.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the request.
+    r : aiohttp.ClientResponse
+        The response of the request.
+    body_hash : str
+        The hash of the response body.
+
+    Returns
+    -------
+    bool
+        True if the body is different from the last response of this url.
+    """
+
+    old = validators.get(url)
+    validators[url] = (r.headers.get("ETag"), r.headers.get("Last-Modified"), body_hash)
+
+    return old is None or old[2] != body_hash
+
+
+async def get_json_data_if_changed(
+    url: str, headers: dict = None, weight: int = 1
+) -> Optional[dict]:
+    """
+    Asynchronous function to poll JSON data from a website.
+    Sends a conditional request if the server gave an ETag or Last-Modified before,
+    and compares the hash of the body with the last response of this url.
+
+    Parameters
+    ----------
+    url : str
+        The URL to get the data from.
+    headers : dict, optional
+        The headers send with the get request, by default None.
+    weight : int, optional
+        The weight of this request for the rate limiter, by default 1.
+
+    Returns
+    -------
+    Optional[dict]
+        The response as a dict, or None if it did not change since the last request or could not be decoded.
+    """
+
+    await rate_limiter.acquire(url, weight)
+
+    async with http_request("GET", url, headers=conditional_headers(url, headers)) as r:
+        if r.status == 304:
+            http_stats["not_modified"] += 1
+            return None
+
+        try:
+            body = await r.read()
+            response = loads(body)
+        except Exception as e:
+            print(f"Error with get request for {url}.", "Error:", e)
+            return None
+
+        if r.status == 200 and not update_validators(
+            url, r, hashlib.sha1(body).hexdigest()
+        ):
+            http_stats["unchanged"] += 1
+            return None
+
+    return response
+
+
+async def post_json_data(
+    url: str, headers: dict = None, weight: int = 1, json: dict = None
+) -> dict:
     """
     Asynchronous function to post JSON data from a website.
 
@@ -85,6 +736,10 @@ async def post_json_data(url: str, headers: dict = None) -> dict:
         The URL to get the data from.
     headers : dict, optional
         The headers send with the post request, by default None.
+    weight : int, optional
+        The weight of this request for the rate limiter, by default 1.
+    json : dict, optional
+        The body of the post request, by default None.
 
     Returns
     -------
@@ -92,16 +747,97 @@ async def post_json_data(url: str, headers: dict = None) -> dict:
         The response as a dict.
     """
 
-    async with aiohttp.ClientSession(headers=headers) as session:
-        async with session.post(
+    response = {}
+
+    await rate_limiter.acquire(url, weight)
+
+    async with http_request("POST", url, headers=headers, json=json) as r:
+        try:
+            response = await r.json(loads=loads)
+        except Exception as e:
+            print(f"Error with post request for {url}.", "Error:", e)
+
+    return response
+
+
+async def stream_json_data(
+    url: str,
+    key: str = None,
+    fields: List[str] = None,
+    headers: dict = None,
+    max_age: float = 0,
+    weight: int = 1,
+    if_changed: bool = False,
+) -> Optional[list]:
+    """
+    Asynchronous function to get the elements of a JSON array while the response is downloaded.
+    Only the given fields of each element are kept, so large responses never have to be in memory at once.
+
+    Parameters
+    ----------
+    url : str
+        The URL to get the data from.
+    key : str, optional
+        The key of the array in the top-level object, by default None which means the response itself is the array.
+    fields : List[str], optional
+        The fields to keep of each element, by default None which keeps everything.
+    headers : dict, optional
+        The headers send with the get request, by default None.
+    max_age : float, optional
+        How old in seconds a cached result may be, by default 0 which disables the cache.
+    weight : int, optional
+        The weight of this request for the rate limiter, by default 1.
+    if_changed : bool, optional
+        If True, None is returned when the response did not change since the last request of this url, by default False.
+
+    Returns
+    -------
+    Optional[list]
+        The (projected) elements of the array.
+        None if the request failed or the array was incomplete, so a partial list is never used as the full one.
+    """
+
+    cache_key = ("stream", url, key, tuple(fields or ()))
+
+    if max_age > 0 and not if_changed:
+        cached = response_cache.get(cache_key, max_age)
+        if cached is not None:
+            return cached
+
+    parser = JSONArrayStream(key, fields)
+    body_hash = hashlib.sha1()
+    elements = []
+    size = 0
+
+    await rate_limiter.acquire(url, weight)
+
+    try:
+        async with http_request(
+            "GET",
             url,
+            headers=conditional_headers(url, headers) if if_changed else headers,
         ) as r:
-            try:
-                response = await r.json()
-            except Exception as e:
-                print(f"Error with get request for {url}.", "Error:", e)
+            if r.status == 304:
+                http_stats["not_modified"] += 1
+                return None
 
-            # Close the connection
-            await session.close()
+            async for chunk in r.content.iter_chunked(64 * 1024):
+                size += len(chunk)
+                body_hash.update(chunk)
+                elements += parser.feed(chunk)
+    except Exception as e:
+        print(f"Error with get request for {url}.", "Error:", e)
+        return None
 
-            return response
+    if parser.state != "done":
+        print(f"Error with get request for {url}.", "Error: incomplete JSON array")
+        return None
+
+    if not update_validators(url, r, body_hash.hexdigest()) and if_changed:
+        http_stats["unchanged"] += 1
+        return None
+
+    if max_age > 0:
+        response_cache.set(cache_key, elements, size)
+
+    return elements
@@ -0,0 +1,267 @@
+## > Imports
+# > Standard libaries
+from __future__ import annotations
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from urllib.parse import quote
+
+# > 3rd Party Dependencies
+import yfinance as yf
+
+# Local dependencies
+from util.vars import config, get_json_data
+from util.cache import TTLCache
+from util.circuit_breaker import breakers
+
+yahoo_config = config.get("YAHOO", {}) or {}
+
+# yfinance is blocking, so it runs in its own threads to keep the event loop free
+# The pool is bounded, so a slow Yahoo Finance can not use up all threads
+executor = ThreadPoolExecutor(
+    max_workers=yahoo_config.get("WORKERS", 4), thread_name_prefix="yfinance"
+)
+
+# The info of a ticker is reused for a short time, by the ticker lookup and the commands
+info_cache = TTLCache(max_entries=yahoo_config.get("CACHE_ENTRIES", 256))
+info_ttl = yahoo_config.get("CACHE_TTL", 60)
+
+# Maximum number of seconds to wait for Yahoo Finance
+info_timeout = yahoo_config.get("TIMEOUT", 10)
+
+# Ticker -> future of the running request, so the same ticker is only requested once at a time
+inflight = {}
+
+# Yahoo Finance only answers the quote endpoint with a crumb that belongs to the cookie of the session
+crumb = None
+yf_headers = {"User-Agent": "Mozilla/5.0"}
+
+# The fields of Ticker.info that are also in the batched quotes, these are all that the bot uses
+quote_fields = [
+    "regularMarketPrice",
+    "regularMarketPreviousClose",
+    "regularMarketVolume",
+    "preMarketPrice",
+    "bid",
+    "exchange",
+]
+
+
+async def get_yf_info(ticker: str) -> dict:
+    """
+    Gets the yfinance Ticker.info of this ticker without blocking the event loop.
+    The result is shared for info_ttl seconds, do not modify it.
+
+    Parameters
+    ----------
+    ticker : str
+        The ticker of the stock.
+
+    Returns
+    -------
+    dict
+        The info of the ticker.
+
+    Raises
+    ------
+    asyncio.TimeoutError
+        If Yahoo Finance did not answer within info_timeout seconds.
+    """
+
+    ticker = ticker.upper()
+
+    if (info := info_cache.get(ticker, info_ttl)) is not None:
+        return info
+
+    if ticker not in inflight:
+        future = asyncio.get_running_loop().run_in_executor(
+            executor, lambda: yf.Ticker(ticker).info
+        )
+        inflight[ticker] = future
+        future.add_done_callback(lambda _: inflight.pop(ticker, None))
+
+    # Shield the shared request, so a timeout of one caller does not cancel it for the others
+    info = await asyncio.wait_for(asyncio.shield(inflight[ticker]), info_timeout)
+    info_cache.set(ticker, info)
+
+    return info
+
+
+async def get_yf_price(ticker: str) -> Optional[float]:
+    """
+    Gets the regular market price of this ticker, errors of Yahoo Finance count as no price.
+
+    Parameters
+    ----------
+    ticker : str
+        The ticker of the stock.
+
+    Returns
+    -------
+    Optional[float]
+        The price, None if Yahoo Finance has no price or could not be reached.
+    """
+
+    try:
+        return (await get_yf_info(ticker)).get("regularMarketPrice")
+    except Exception as e:
+        print(f"Yahoo Finance error for {ticker}. Error:", e)
+        return None
+
+
+def has_yf_info(ticker: str) -> bool:
+    """
+    Checks if the info of this ticker is in the info cache, so get_yf_info() does not need a request.
+
+    Parameters
+    ----------
+    ticker : str
+        The ticker of the stock.
+
+    Returns
+    -------
+    bool
+        True if the info is cached.
+    """
+
+    return info_cache.get(ticker.upper(), info_ttl) is not None
+
+
+async def get_yf_crumb(refresh: bool = False) -> Optional[str]:
+    """
+    Gets the crumb that Yahoo Finance requires for the quote endpoint.
+    The cookie that belongs to it is kept by the shared session.
+
+    Parameters
+    ----------
+    refresh : bool, optional
+        If True a new crumb is requested, for instance after Yahoo Finance rejected the old one, by default False.
+
+    Returns
+    -------
+    Optional[str]
+        The crumb, None if it could not be requested.
+    """
+
+    global crumb
+
+    if crumb is None or refresh:
+        # This only sets the cookie, the page itself is an error page
+        await get_json_data(
+            "https://fc.yahoo.com", headers=yf_headers, text=True, max_age=0
+        )
+
+        response = await get_json_data(
+            "https://query1.finance.yahoo.com/v1/test/getcrumb",
+            headers=yf_headers,
+            text=True,
+            max_age=0,
+        )
+
+        # Errors are returned as a dict or an HTML / JSON page
+        if (
+            isinstance(response, str)
+            and response
+            and not response.startswith(("<", "{"))
+        ):
+            crumb = response.strip()
+        else:
+            print("Could not get the Yahoo Finance crumb. Error:", response)
+            crumb = None
+
+    return crumb
+
+
+async def request_yf_quotes(tickers: List[str]) -> Optional[List[dict]]:
+    """
+    Requests the quotes of at most 100 tickers, with a new crumb if Yahoo Finance rejected the old one.
+
+    Parameters
+    ----------
+    tickers : List[str]
+        The tickers of the stocks.
+
+    Returns
+    -------
+    Optional[List[dict]]
+        The quotes, None if Yahoo Finance did not answer with quotes.
+    """
+
+    for refresh in (False, True):
+        if (yf_crumb := await get_yf_crumb(refresh)) is None:
+            return None
+
+        data = await get_json_data(
+            "https://query1.finance.yahoo.com/v7/finance/quote?symbols="
+            + ",".join(tickers)
+            + "&crumb="
+            + quote(yf_crumb),
+            headers=yf_headers,
+            max_age=0,
+        )
+
+        try:
+            return data["quoteResponse"]["result"]
+        except Exception:
+            # For instance {"finance": {"error": {"code": "Unauthorized", "description": "Invalid Crumb"}}}
+            print("Could not get the Yahoo Finance quotes. Error:", data)
+
+    return None
+
+
+async def get_yf_quotes(tickers: List[str]) -> dict:
+    """
+    Gets the quotes of many tickers in one request to Yahoo Finance.
+    The quotes are added to the info cache, so get_yf_info() returns them without another request.
+
+    Parameters
+    ----------
+    tickers : List[str]
+        The tickers of the stocks.
+
+    Returns
+    -------
+    dict
+        Maps the uppercase ticker to its quote, a dict with the quote_fields.
+        Tickers that Yahoo Finance does not know, or that could not be requested, are left out.
+    """
+
+    quotes = {}
+    missing = []
+
+    for ticker in {ticker.upper() for ticker in tickers}:
+        if (info := info_cache.get(ticker, info_ttl)) is not None:
+            quotes[ticker] = info
+        else:
+            missing.append(ticker)
+
+    # Skip Yahoo Finance while it is down
+    if not missing or not breakers["yahoo"].available():
+        return quotes
+
+    breaker = breakers["yahoo"]
+
+    # The symbols are send in the URL, so ask for at most 100 at once
+    for i in range(0, len(missing), 100):
+        start = time.monotonic()
+
+        try:
+            results = await request_yf_quotes(missing[i : i + 100])
+        except Exception as e:
+            print("Could not get the Yahoo Finance quotes. Error:", e)
+            results = None
+
+        # The quotes are only requested in advance, the lookups still work without them
+        if results is None:
+            breaker.record(False)
+            return quotes
+
+        breaker.record(True, time.monotonic() - start)
+
+        for result in results:
+            info = {field: result.get(field) for field in quote_fields}
+            info_cache.set(result["symbol"], info)
+            quotes[result["symbol"]] = info
+
+    return quotes